@@ -1,11 +1,19 @@
 import wx
 import wx.grid as gridlib
 import sqlite3
-import csv
-from cytolk import tolk
-from typing import Optional, Tuple
+import os
+from typing import List, Optional, Tuple
 
-from grid_components import SQLiteGridTable, DataTypeAwareGrid
+from grid_components import FILTER_OPERATORS, INDEXABLE_OPERATORS, SQLiteGridTable, DataTypeAwareGrid, TableSnapshot, quote_identifier
+from connection import ConnectionProfile, load_profile, open_connection, save_profile
+from workers import DatabaseWorker, DatabaseLoader, TableLoader
+from exporter import EXPORT_FORMATS, ExportJob, ExportProgress, ExportTarget, export_path
+from importer import IMPORT_WILDCARD, ImportJob, ImportOptions, ImportProgress
+from column_sizer import ColumnSizer
+from table_cache import TableCache
+from speech import AnnouncementCache, SpeechDispatcher
+from dialogs import ConnectionDialog, ExportDialog, FindDialog, ImportDialog, PerformanceDialog
+from instrumentation import profiler
 
 # --- Constants ---
 APP_TITLE = 'SQLite Editor'
@@ -14,14 +22,25 @@ WELCOME_MESSAGE = (
     "Welcome to SQLite Editor!\n\n"
     "Please select a file by choosing 'Open' from the 'File' menu (Ctrl+O)."
 )
+INDEX_SUGGESTION_ROWS = 10000  # offer to create an index when a sort or filter would scan at least this many rows
 
 class SQLiteEditor(wx.Frame):
     def __init__(self, *args, **kw):
         super().__init__(*args, **kw)
         self.db_conn: Optional[sqlite3.Connection] = None
+        self.db_path: Optional[str] = None
+        self.profile = ConnectionProfile()
+        self._loader: Optional[DatabaseWorker] = None
+        self._export_job: Optional[ExportJob] = None
+        self._import_job: Optional[ImportJob] = None
+        self._export_milestone: Tuple[str, int] = ("", 0)
         self.edit_mode: bool = False
         self.last_spoken_cell: Tuple[Optional[int], Optional[int]] = (None, None)
+        self.speech = SpeechDispatcher(); self._announcements = AnnouncementCache()
         self.grid_table: Optional[SQLiteGridTable] = None
+        self._column_sizer: Optional[ColumnSizer] = None
+        self.table_cache = TableCache()
+        self._find_state: Tuple[str, Optional[int]] = ("", None)
         self.config = wx.Config(APP_TITLE, APP_VENDOR)
         self.file_history = wx.FileHistory(9)
         self.file_history.Load(self.config)
@@ -48,6 +67,16 @@ class SQLiteEditor(wx.Frame):
         table_sizer.Add(self.table_list, 1, wx.EXPAND | wx.RIGHT, 10)
         table_sizer.Add(self.current_table_display, 1, wx.ALIGN_CENTER_VERTICAL | wx.LEFT, 10)
         self.main_sizer.Add(table_sizer, 0, wx.EXPAND | wx.ALL, 5)
+        self.filter_sizer = wx.BoxSizer(wx.HORIZONTAL)
+        self.filter_column_label = wx.StaticText(panel, label="Filter column:"); self.filter_column = wx.Choice(panel)
+        self.filter_op_label = wx.StaticText(panel, label="Operator:"); self.filter_op = wx.Choice(panel, choices=list(FILTER_OPERATORS)); self.filter_op.SetSelection(0)
+        self.filter_value_label = wx.StaticText(panel, label="Value:"); self.filter_value = wx.TextCtrl(panel, style=wx.TE_PROCESS_ENTER)
+        self.filter_apply_button = wx.Button(panel, label="&Apply Filter"); self.filter_clear_button = wx.Button(panel, label="C&lear Filter")
+        for control in (self.filter_column_label, self.filter_column, self.filter_op_label, self.filter_op, self.filter_value_label):
+            self.filter_sizer.Add(control, 0, wx.ALIGN_CENTER_VERTICAL | wx.RIGHT, 5)
+        self.filter_sizer.Add(self.filter_value, 1, wx.EXPAND | wx.RIGHT, 5)
+        self.filter_sizer.Add(self.filter_apply_button, 0, wx.RIGHT, 5); self.filter_sizer.Add(self.filter_clear_button, 0)
+        self.main_sizer.Add(self.filter_sizer, 0, wx.EXPAND | wx.ALL, 5)
         self.data_grid = DataTypeAwareGrid(panel)
         self.data_grid.EnableEditing(False)
         self.main_sizer.Add(self.data_grid, 1, wx.EXPAND | wx.ALL, 5)
@@ -58,8 +87,11 @@ class SQLiteEditor(wx.Frame):
         menubar = wx.MenuBar()
         file_menu = wx.Menu()
         file_menu.Append(wx.ID_OPEN, "&Open...\tCtrl+O")
-        self.export_csv_item = file_menu.Append(wx.ID_ANY, "Export to CSV...", "Export the current table to a CSV file")
+        self.export_item = file_menu.Append(wx.ID_ANY, "&Export...\tCtrl+E", "Export the current view, table or database to CSV, TSV, JSON Lines or SQL")
+        self.import_item = file_menu.Append(wx.ID_ANY, "&Import...\tCtrl+I", "Import a CSV, TSV or JSON Lines file into a new or existing table")
+        self.cancel_transfer_item = file_menu.Append(wx.ID_ANY, "Cancel Export/Import", "Stop the export or import that is running")
         self.save_item = file_menu.Append(wx.ID_SAVE, "&Save Changes\tCtrl+S")
+        self.connection_item = file_menu.Append(wx.ID_ANY, "Connection Se&ttings...", "Cache, memory-mapped I/O, locking and journaling for this database")
         file_menu.AppendSeparator()
         recent_files_menu = wx.Menu()
         self.file_history.UseMenu(recent_files_menu)
@@ -71,24 +103,54 @@ class SQLiteEditor(wx.Frame):
         edit_menu = wx.Menu()
         self.toggle_edit_item = edit_menu.AppendCheckItem(wx.ID_EDIT, "Enable &Editing")
         edit_menu.AppendSeparator()
+        self.undo_item = edit_menu.Append(wx.ID_UNDO, "&Undo\tCtrl+Z")
+        self.redo_item = edit_menu.Append(wx.ID_REDO, "&Redo\tCtrl+Y")
+        edit_menu.AppendSeparator()
         self.add_row_item = edit_menu.Append(wx.ID_ADD, "Add Row\tCtrl+N")
         self.delete_row_item = edit_menu.Append(wx.ID_DELETE, "Delete Row\tCtrl+D")
         menubar.Append(edit_menu, "&Edit")
         view_menu = wx.Menu()
         self.view_schema_item = view_menu.Append(wx.ID_ANY, "View Table Schema")
+        view_menu.AppendSeparator()
+        self.sort_item = view_menu.Append(wx.ID_ANY, "&Sort by Current Column\tCtrl+T", "Sort ascending, then descending, then unsorted")
+        self.filter_item = view_menu.Append(wx.ID_ANY, "&Filter...\tCtrl+L", "Move to the filter bar")
+        self.clear_view_item = view_menu.Append(wx.ID_ANY, "&Clear Sort and Filter\tCtrl+Shift+L")
+        view_menu.AppendSeparator()
+        self.find_item = view_menu.Append(wx.ID_FIND, "&Find...\tCtrl+F")
+        self.find_next_item = view_menu.Append(wx.ID_ANY, "Find &Next\tF3")
+        self.find_prev_item = view_menu.Append(wx.ID_ANY, "Find &Previous\tShift+F3")
+        view_menu.AppendSeparator()
+        self.performance_item = view_menu.Append(wx.ID_ANY, "&Performance...", "Query timings and query plans")
         menubar.Append(view_menu, "&View")
         self.SetMenuBar(menubar)
 
     def _bind_events(self):
         self.Bind(wx.EVT_CLOSE, self.on_quit)
         self.Bind(wx.EVT_MENU, self.on_open, id=wx.ID_OPEN)
+        self.Bind(wx.EVT_MENU, self.on_connection_settings, self.connection_item)
         self.Bind(wx.EVT_MENU, self.on_save_changes, self.save_item)
         self.Bind(wx.EVT_MENU, self.on_quit, id=wx.ID_EXIT)
         self.Bind(wx.EVT_MENU, self.on_toggle_edit_mode, self.toggle_edit_item)
         self.Bind(wx.EVT_MENU, self.on_add_row, self.add_row_item)
         self.Bind(wx.EVT_MENU, self.on_delete_row, self.delete_row_item)
+        self.Bind(wx.EVT_MENU, self.on_undo, self.undo_item)
+        self.Bind(wx.EVT_MENU, self.on_redo, self.redo_item)
         self.Bind(wx.EVT_MENU, self.on_view_schema, self.view_schema_item)
-        self.Bind(wx.EVT_MENU, self.on_export_csv, self.export_csv_item)
+        self.Bind(wx.EVT_MENU, self.on_sort_current_column, self.sort_item)
+        self.Bind(wx.EVT_MENU, lambda event: self.filter_column.SetFocus(), self.filter_item)
+        self.Bind(wx.EVT_MENU, self.on_clear_view, self.clear_view_item)
+        self.Bind(wx.EVT_MENU, self.on_performance, self.performance_item)
+        self.Bind(wx.EVT_MENU, self.on_find, self.find_item)
+        self.Bind(wx.EVT_MENU, lambda event: self._find(forward=True), self.find_next_item)
+        self.Bind(wx.EVT_MENU, lambda event: self._find(forward=False), self.find_prev_item)
+        self.filter_apply_button.Bind(wx.EVT_BUTTON, self.on_apply_filter)
+        self.filter_value.Bind(wx.EVT_TEXT_ENTER, self.on_apply_filter)
+        self.filter_clear_button.Bind(wx.EVT_BUTTON, self.on_clear_filter)
+        self.data_grid.Bind(gridlib.EVT_GRID_COL_SORT, self.on_grid_col_sort)
+        self.data_grid.Bind(gridlib.EVT_GRID_COL_SIZE, self.on_grid_col_size)
+        self.Bind(wx.EVT_MENU, self.on_export, self.export_item)
+        self.Bind(wx.EVT_MENU, self.on_import, self.import_item)
+        self.Bind(wx.EVT_MENU, self.on_cancel_transfer, self.cancel_transfer_item)
         self.Bind(wx.EVT_MENU_RANGE, self.on_file_history, id=wx.ID_FILE1, id2=wx.ID_FILE9)
         self.table_list.Bind(wx.EVT_COMBOBOX, self.on_table_selected)
         self.data_grid.Bind(gridlib.EVT_GRID_CELL_CHANGING, self.on_grid_cell_changing)
@@ -99,9 +161,11 @@ class SQLiteEditor(wx.Frame):
     def _update_ui_state(self, has_db: bool, has_tables: bool = False):
         self.welcome_message.Show(not has_db)
         is_data_visible = has_db and has_tables
-        self.data_grid.Show(is_data_visible); self.table_list_label.Show(has_db); self.table_list.Show(has_db); self.current_table_display.Show(has_db)
+        self.data_grid.Show(is_data_visible); self.main_sizer.Show(self.filter_sizer, is_data_visible, recursive=True); self.table_list_label.Show(has_db); self.table_list.Show(has_db); self.current_table_display.Show(has_db)
         self.save_item.Enable(is_data_visible); self.toggle_edit_item.Enable(is_data_visible); self.add_row_item.Enable(is_data_visible and self.edit_mode)
-        self.delete_row_item.Enable(is_data_visible and self.edit_mode); self.view_schema_item.Enable(is_data_visible); self.export_csv_item.Enable(is_data_visible)
+        self.delete_row_item.Enable(is_data_visible and self.edit_mode); self.undo_item.Enable(is_data_visible and self.edit_mode); self.redo_item.Enable(is_data_visible and self.edit_mode); self.view_schema_item.Enable(is_data_visible); self.export_item.Enable(is_data_visible)
+        for item in (self.sort_item, self.filter_item, self.clear_view_item, self.find_item, self.find_next_item, self.find_prev_item): item.Enable(is_data_visible)
+        self.import_item.Enable(has_db and self.edit_mode); self.connection_item.Enable(has_db); self.cancel_transfer_item.Enable(self._export_job is not None or self._import_job is not None)
         self.main_sizer.Layout()
 
     def on_open(self, event: wx.CommandEvent):
@@ -118,50 +182,145 @@ class SQLiteEditor(wx.Frame):
         self.file_history.AddFileToHistory(path)
         self._load_database(path)
 
-    def on_export_csv(self, event: wx.CommandEvent):
-        if not self.grid_table: tolk.speak("No table loaded to export."); return
+    def on_export(self, event: wx.CommandEvent):
+        if not self.grid_table or not self.db_path: self.speech.speak("No table loaded to export."); return
+        if self._export_job: self.speech.speak("An export is already running."); return
         table_name = self.grid_table.table_name
-        with wx.FileDialog(self, "Export to CSV", wildcard="CSV files (*.csv)|*.csv", style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT, defaultFile=f"{table_name}.csv") as dlg:
+        with ExportDialog(self, table_name) as dlg:
+            if dlg.ShowModal() != wx.ID_OK: return
+            fmt, scope, compress = dlg.export_format, dlg.scope, dlg.compress
+        if scope == 'all':
+            with wx.DirDialog(self, "Export all tables to folder") as dlg:
+                if dlg.ShowModal() == wx.ID_CANCEL: return
+                directory = dlg.GetPath()
+            tables = [self.table_list.GetString(i) for i in range(self.table_list.GetCount())]
+            targets = [ExportTarget(name, f"SELECT * FROM {quote_identifier(name)}", (), export_path(directory, name, fmt, compress)) for name in tables]
+        else:
+            default_file = os.path.basename(export_path("", table_name, fmt, compress)); extension = default_file.split(".", 1)[1]
+            wildcard = f"{EXPORT_FORMATS[fmt].label} (*.{extension})|*.{extension}|All files (*.*)|*.*"
+            with wx.FileDialog(self, "Export", wildcard=wildcard, style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT, defaultFile=default_file) as dlg:
+                if dlg.ShowModal() == wx.ID_CANCEL: return
+                pathname = dlg.GetPath()
+            query, params = self.grid_table.view_query() if scope == 'view' else (f"SELECT * FROM {quote_identifier(table_name)}", ())
+            targets = [ExportTarget(table_name, query, params, pathname)]
+        if self.grid_table.is_dirty(): self.speech.speak("Unsaved changes are not included in the export.")
+        self._export_job = ExportJob(self.db_path, targets, fmt, compress, self._on_export_done, self._on_export_error, self._on_export_progress, self.profile)
+        self._export_milestone = ("", 0); self._export_job.start()
+        self._update_transfer_state("Export started.")
+    def on_cancel_transfer(self, event: Optional[wx.CommandEvent]):
+        for job, kind in ((self._export_job, "Export"), (self._import_job, "Import")):
+            if job: job.cancel(); self._update_statusbar(f"{kind} cancelled."); self.speech.speak(f"{kind} cancelled.")
+        self._export_job = self._import_job = None; self.cancel_transfer_item.Enable(False)
+    def _update_transfer_state(self, message: str):
+        self.cancel_transfer_item.Enable(self._export_job is not None or self._import_job is not None); self._update_statusbar(message); self.speech.speak(message)
+    def _on_export_progress(self, progress: ExportProgress):
+        total = f" of {progress.total_rows:,}" if progress.total_rows else ""
+        self._update_statusbar(f"Exporting {progress.table_name}: {progress.rows:,}{total} rows ({progress.rows_per_sec:,.0f} rows/sec)")
+        if not progress.total_rows: return
+        quarter = progress.rows * 4 // progress.total_rows
+        # Tables are exported one after another: a new table name starts its milestones over.
+        if progress.table_name != self._export_milestone[0]: self._export_milestone = (progress.table_name, 0)
+        if quarter > self._export_milestone[1]:
+            self._export_milestone = (progress.table_name, quarter); self.speech.speak(f"{progress.table_name} {quarter * 25} percent exported.")
+    def _on_export_done(self, results: List[ExportProgress]):
+        self._export_job = None
+        rows = sum(r.rows for r in results); rate = sum(r.rows_per_sec for r in results) / max(len(results), 1)
+        tables = f"{len(results)} tables" if len(results) != 1 else results[0].table_name
+        self._update_transfer_state(f"Exported {rows:,} rows from {tables} ({rate:,.0f} rows/sec).")
+    def _on_export_error(self, error: Exception):
+        self._export_job = None; self._update_transfer_state("Export failed.")
+        wx.MessageBox(f"Error exporting file: {error}", "Export Error", wx.OK | wx.ICON_ERROR)
+
+    def on_import(self, event: wx.CommandEvent):
+        if not self.db_conn or not self.db_path: return
+        if not self.edit_mode: self.speech.speak("Enable editing to import data."); return
+        if self._import_job: self.speech.speak("An import is already running."); return
+        if self._check_unsaved_changes() == wx.ID_CANCEL: return
+        with wx.FileDialog(self, "Import data", wildcard=IMPORT_WILDCARD, style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as dlg:
             if dlg.ShowModal() == wx.ID_CANCEL: return
-            pathname = dlg.GetPath()
-            try:
-                with open(pathname, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(self.grid_table.col_names)
-                    writer.writerows(self.grid_table.data)
-                self._update_statusbar(f"Successfully exported to {pathname}")
-                tolk.speak("Export successful.")
-            except IOError as e:
-                wx.MessageBox(f"Error exporting file: {e}", "Export Error", wx.OK | wx.ICON_ERROR)
-                tolk.speak("Export failed.")
-                
+            source = dlg.GetPath()
+        tables = [self.table_list.GetString(i) for i in range(self.table_list.GetCount())]
+        current = self.grid_table.table_name if self.grid_table else None
+        with ImportDialog(self, tables, current, os.path.basename(source).split(".")[0]) as dlg:
+            if dlg.ShowModal() != wx.ID_OK: return
+            options = ImportOptions(source, dlg.table_name, dlg.create_table, dlg.fast_pragmas, dlg.defer_indexes)
+        if not options.table_name: self.speech.speak("A table name is required."); return
+        if options.create_table and options.table_name in tables:
+            wx.MessageBox(f"A table named '{options.table_name}' already exists.", "Import Error", wx.OK | wx.ICON_ERROR); return
+        self._import_job = ImportJob(self.db_path, options, self._on_import_done, self._on_import_error, self._on_import_progress, self.profile)
+        self._import_job.start(); self._update_transfer_state("Import started.")
+    def _on_import_progress(self, progress: ImportProgress):
+        rejected = f", {progress.rejected:,} rejected" if progress.rejected else ""
+        self._update_statusbar(f"Importing into {progress.table_name}: {progress.rows:,} rows ({progress.rows_per_sec:,.0f} rows/sec){rejected}")
+    def _on_import_done(self, result: ImportProgress):
+        self._import_job = None
+        message = f"Imported {result.rows:,} rows into {result.table_name} ({result.rows_per_sec:,.0f} rows/sec)."
+        if result.rejected: message += f" {result.rejected:,} rows rejected, see {result.reject_path}."
+        self._update_transfer_state(message)
+        if self.table_list.FindString(result.table_name) == wx.NOT_FOUND: self.table_list.Append(result.table_name)
+        if self.grid_table and self.grid_table.table_name == result.table_name:
+            # Reloading discards the journal, so edits made while the import ran are saved or dropped only if the user says so.
+            if self._check_unsaved_changes() == wx.ID_CANCEL:
+                self._update_statusbar("Unsaved changes kept. Reload the table to see the imported rows."); self.speech.speak("Unsaved changes kept. Reload the table to see the imported rows.")
+            else: self.grid_table.refresh_data(); self.data_grid.ForceRefresh()
+        elif not self.grid_table: self.table_list.SetStringSelection(result.table_name); self._load_table_data(result.table_name)
+        self._update_ui_state(has_db=True, has_tables=True)
+    def _on_import_error(self, error: Exception):
+        self._import_job = None; self._update_transfer_state("Import failed.")
+        wx.MessageBox(f"Error importing file: {error}", "Import Error", wx.OK | wx.ICON_ERROR)
+
     def _load_database(self, path: str):
+        self._cancel_loading(); self._close_table()
         try:
             if self.db_conn: self.db_conn.close()
-            self.db_conn = sqlite3.connect(path); cursor = self.db_conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [table[0] for table in cursor.fetchall()]
-            self.SetTitle(f"{APP_TITLE} - {path.split('/')[-1]}")
-            self.file_history.AddFileToHistory(path)
-            self.file_history.Save(self.config)
-            self._update_statusbar("Database loaded", path, "")
-            if not tables:
-                tolk.speak("Database loaded, but no tables were found."); self.grid_table = None
-                self._update_ui_state(has_db=True, has_tables=False); self.table_list.Clear()
-                if self.data_grid.GetTable(): self.data_grid.SetTable(None, takeOwnership=True)
-                return
-            tolk.speak(f"Connected. {len(tables)} tables found."); self.table_list.Set(tables)
-            self.table_list.SetSelection(0); self._load_table_data(tables[0])
-            self._update_ui_state(has_db=True, has_tables=True)
-        except sqlite3.Error as e:
-            wx.MessageBox(f"Error opening database: {e}", "Database Error", wx.OK | wx.ICON_ERROR)
-            self.db_conn = None; self.SetTitle(APP_TITLE)
-            self._update_ui_state(has_db=False)
-            
+            self.db_conn = None; self.profile = load_profile(self.config, path)
+            self.db_conn = open_connection(path, self.profile, read_only=not self.edit_mode); self.db_path = path
+        except sqlite3.Error as e: self._on_database_error(e); return
+        self.SetTitle(f"{APP_TITLE} - {path.split('/')[-1]}")
+        self.file_history.AddFileToHistory(path)
+        self.file_history.Save(self.config); save_profile(self.config, path, self.profile)
+        self._update_statusbar("Opening database...", path, "")
+        self._update_ui_state(has_db=True, has_tables=False); self.table_list.Clear()
+        tables, recent = self.table_cache.tables(path, self.db_conn), self.table_cache.recent_table(path)
+        view = self.table_cache.take(path, self.db_conn, recent) if tables and recent in tables else None
+        if tables and view:
+            self._update_statusbar("Database loaded"); self.speech.speak(f"Connected. {len(tables)} tables found.")
+            self.table_list.Set(tables); self.table_list.SetStringSelection(view.table_name); self._attach_table(view)
+            self._update_ui_state(has_db=True, has_tables=True); return
+        self._start_loader(DatabaseLoader(path, self._on_database_loaded, self._on_database_error, self._update_statusbar, self.profile))
+    def _on_database_loaded(self, result: Tuple[List[str], Optional[TableSnapshot]]):
+        tables, snapshot = result
+        self._update_statusbar("Database loaded")
+        if not tables or snapshot is None:
+            self.speech.speak("Database loaded, but no tables were found."); self._update_ui_state(has_db=True, has_tables=False)
+            return
+        if self.db_conn and self.db_path: self.table_cache.put_tables(self.db_path, self.db_conn, tables)
+        self.speech.speak(f"Connected. {len(tables)} tables found."); self.table_list.Set(tables)
+        self.table_list.SetStringSelection(snapshot.table_name); self._show_table(snapshot)
+        self._update_ui_state(has_db=True, has_tables=True)
+    def _on_database_error(self, error: Exception):
+        wx.MessageBox(f"Error opening database: {error}", "Database Error", wx.OK | wx.ICON_ERROR)
+        if self.db_conn: self.db_conn.close()
+        self.db_conn = None; self.db_path = None; self.SetTitle(APP_TITLE)
+        self._update_ui_state(has_db=False)
+    def _start_loader(self, loader: DatabaseWorker):
+        """Starts a background load, cancelling (and interrupting) any load still in flight."""
+        self._cancel_loading(); self._loader = loader; loader.start()
+    def _cancel_loading(self):
+        if self._loader: self._loader.cancel(); self._loader = None
+    def _close_table(self):
+        self._park_table(); self.grid_table = None
+        if self.data_grid.GetTable(): self.data_grid.SetTable(None, takeOwnership=False)
+    def _park_table(self):
+        """Saves the shown table's column widths and hands the table to the cache for a quick return."""
+        self._save_column_widths()
+        if self.grid_table and self.db_conn and self.db_path: self.table_cache.park(self.db_path, self.db_conn, self.grid_table)
+
     def on_quit(self, event: wx.Event):
         if self._check_unsaved_changes() == wx.ID_CANCEL:
             if isinstance(event, wx.CloseEvent): event.Veto()
             return
+        self._cancel_loading(); self.on_cancel_transfer(None); self.speech.cancel(); self._save_column_widths()
         self.file_history.Save(self.config)
         self.config.Flush()
         if self.db_conn: self.db_conn.close()
@@ -183,26 +342,72 @@ class SQLiteEditor(wx.Frame):
         table_name = self.table_list.GetStringSelection()
         if table_name: self._load_table_data(table_name)
     def _load_table_data(self, table_name: str):
+        if not self.db_conn or not self.db_path: return
+        view = self.table_cache.take(self.db_path, self.db_conn, table_name)
+        if view: self._cancel_loading(); self._attach_table(view); return
+        self._update_statusbar(f"Loading table: {table_name}...")
+        on_error = lambda e: wx.MessageBox(f"Error loading table '{table_name}': {e}", "Error", wx.OK | wx.ICON_ERROR)
+        self._start_loader(TableLoader(self.db_path, table_name, self._show_table, on_error, self._update_statusbar, self.profile))
+    def _show_table(self, snapshot: TableSnapshot):
         if not self.db_conn: return
-        try:
-            self.grid_table = SQLiteGridTable(self.db_conn, table_name)
-            self.data_grid.SetTable(self.grid_table, takeOwnership=True)
-            self.data_grid.AutoSizeColumns(); self.data_grid.ForceRefresh()
-            self.current_table_display.SetLabel(f"Current Table: {table_name}")
-            rows, cols = self.grid_table.GetNumberRows(), self.grid_table.GetNumberCols()
-            self._update_statusbar(f"Loaded table: {table_name}", None, f"{rows} rows, {cols} columns")
-            tolk.speak(f"Loaded table: {table_name}."); self.data_grid.GoToCell(0, 0)
-        except Exception as e: wx.MessageBox(f"Error loading table '{table_name}': {e}", "Error", wx.OK | wx.ICON_ERROR)
+        try: self._attach_table(SQLiteGridTable(self.db_conn, snapshot.table_name, snapshot=snapshot))
+        except Exception as e: wx.MessageBox(f"Error loading table '{snapshot.table_name}': {e}", "Error", wx.OK | wx.ICON_ERROR)
+    def _attach_table(self, table: SQLiteGridTable):
+        """Shows a new or cached table view, parking the one it replaces."""
+        self._park_table()
+        self.grid_table = table; self._announcements.clear(); table_name = table.table_name
+        table.read_failed = lambda e: wx.CallAfter(self._update_statusbar, f"Could not read rows: {e}")
+        # Not owned by the grid: parked views stay alive in the table cache after the grid lets go of them.
+        self.data_grid.SetTable(table, takeOwnership=False)
+        # Sampled sizing: measuring every cell would fault in every page of a virtual table.
+        self._column_sizer = ColumnSizer(self.data_grid, table, self.config, self.db_path or ""); self._column_sizer.apply()
+        self.data_grid.ForceRefresh()
+        self.current_table_display.SetLabel(f"Current Table: {table_name}"); self.filter_column.Set(table.col_names)
+        if table.filters:
+            col, op, value = table.filters[0]
+            self.filter_column.SetSelection(col); self.filter_op.SetStringSelection(op); self.filter_value.SetValue("" if value is None else str(value))
+        else: self.filter_column.SetSelection(0); self.filter_value.SetValue("")
+        if table.sort: self.data_grid.SetSortingColumn(table.sort[0], not table.sort[1])
+        else: self.data_grid.UnsetSortingColumn()
+        rows, cols = table.GetNumberRows(), table.GetNumberCols()
+        self._update_statusbar(f"Loaded table: {table_name}", None, f"{rows} rows, {cols} columns")
+        self.speech.speak(f"Loaded table: {table_name}.")
+        if rows: self.data_grid.GoToCell(0, 0)
+    def _reopen_connection(self, read_only: bool):
+        """Swaps the main connection for a read-only or writable one; the open table keeps its cached pages."""
+        if not self.db_path: return
+        conn = open_connection(self.db_path, self.profile, read_only)
+        if self.db_conn: self.db_conn.close()
+        self.db_conn = conn
+        if self.grid_table: self.grid_table.db_conn = conn
     def on_toggle_edit_mode(self, event: wx.CommandEvent):
-        self.edit_mode = event.IsChecked(); self.data_grid.EnableEditing(self.edit_mode)
-        tolk.speak(f"Edit mode {'enabled' if self.edit_mode else 'disabled'}.")
+        enable = event.IsChecked()
+        if not enable and self.grid_table and self.grid_table.is_dirty():
+            result = self._check_unsaved_changes()
+            if result == wx.ID_CANCEL: self.toggle_edit_item.Check(True); return
+            if result == wx.ID_NO: self.grid_table.refresh_data(); self.data_grid.ForceRefresh()
+        if self.data_grid.IsCellEditControlShown(): self.data_grid.HideCellEditControl()
+        try: self._reopen_connection(read_only=not enable)
+        except sqlite3.Error as e:
+            self.toggle_edit_item.Check(self.edit_mode)
+            wx.MessageBox(f"Could not reopen the database {'for writing' if enable else 'read-only'}: {e}", "Database Error", wx.OK | wx.ICON_ERROR); return
+        self.edit_mode = enable; self.data_grid.EnableEditing(self.edit_mode)
+        self.speech.speak(f"Edit mode {'enabled' if self.edit_mode else 'disabled'}.")
         self._update_ui_state(has_db=self.db_conn is not None, has_tables=self.table_list.GetCount() > 0)
-        if not self.edit_mode and self.data_grid.IsCellEditControlShown(): self.data_grid.HideCellEditControl()
+    def on_connection_settings(self, event: wx.CommandEvent):
+        if not self.db_path: return
+        with ConnectionDialog(self, self.profile) as dlg:
+            if dlg.ShowModal() != wx.ID_OK: return
+            self.profile = dlg.profile
+        save_profile(self.config, self.db_path, self.profile)
+        try: self._reopen_connection(read_only=not self.edit_mode)
+        except sqlite3.Error as e: wx.MessageBox(f"Could not reopen the database: {e}", "Database Error", wx.OK | wx.ICON_ERROR); return
+        self._update_statusbar("Connection settings applied."); self.speech.speak("Connection settings applied.")
     def on_save_changes(self, event: Optional[wx.CommandEvent]):
         if not self.grid_table: return
         if self.data_grid.IsCellEditControlShown(): self.data_grid.HideCellEditControl()
         success, message = self.grid_table.apply_changes()
-        tolk.speak(message); self._update_statusbar(message)
+        self.speech.speak(message); self._update_statusbar(message)
         if success:
             self.data_grid.ProcessTableMessage(gridlib.GridTableMessage(self.grid_table, gridlib.GRIDTABLE_REQUEST_VIEW_GET_VALUES))
             self.data_grid.ForceRefresh()
@@ -213,7 +418,7 @@ class SQLiteEditor(wx.Frame):
         self.grid_table.insert_row(insert_pos)
         msg = gridlib.GridTableMessage(self.grid_table, gridlib.GRIDTABLE_NOTIFY_ROWS_INSERTED, insert_pos, 1)
         self.data_grid.ProcessTableMessage(msg)
-        tolk.speak(f"Added new row at position {insert_pos + 1}")
+        self.speech.speak(f"Added new row at position {insert_pos + 1}")
         self._update_statusbar("Row added. Save changes to commit.")
     def on_delete_row(self, event: wx.CommandEvent):
         if not self.grid_table or self.data_grid.GetNumberRows() == 0: return
@@ -226,19 +431,106 @@ class SQLiteEditor(wx.Frame):
             self.data_grid.ProcessTableMessage(msg)
             new_cursor_row = max(0, row_to_delete - 1)
             self.data_grid.SetGridCursor(new_cursor_row, current_col)
-            tolk.speak(f"Row {row_to_delete + 1} deleted."); self._update_statusbar("Row deleted. Save changes to commit.")
-        else: tolk.speak("Could not delete row.")
+            self.speech.speak(f"Row {row_to_delete + 1} deleted."); self._update_statusbar("Row deleted. Save changes to commit.")
+        else: self.speech.speak("Could not delete row.")
+    def on_undo(self, event: wx.CommandEvent): self._replay_journal(undo=True)
+    def on_redo(self, event: wx.CommandEvent): self._replay_journal(undo=False)
+    def _replay_journal(self, undo: bool):
+        if not self.grid_table or not self.edit_mode: return
+        if self.data_grid.IsCellEditControlShown(): self.data_grid.HideCellEditControl()
+        action = "Undo" if undo else "Redo"
+        row = self.grid_table.undo() if undo else self.grid_table.redo()
+        if row is None: self.speech.speak(f"Nothing to {action.lower()}."); return
+        self.data_grid.ForceRefresh()
+        if row >= 0: self.data_grid.SetGridCursor(row, max(0, self.data_grid.GetGridCursorCol())); self.data_grid.MakeCellVisible(row, max(0, self.data_grid.GetGridCursorCol()))
+        self.speech.speak(f"{action}. Row {row + 1}."); self._update_statusbar(f"{action} applied.")
     def on_view_schema(self, event: wx.CommandEvent):
-        if not self.grid_table or not self.db_conn: tolk.speak("No table is loaded."); return
+        if not self.grid_table or not self.db_conn: self.speech.speak("No table is loaded."); return
         try:
             table_name = self.grid_table.table_name
             cursor = self.db_conn.cursor(); cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table_name,)); result = cursor.fetchone()
             if result and result[0]:
                 schema = result[0]
                 dlg = wx.MessageDialog(self, f"Schema for table '{table_name}':\n\n{schema}", "Table Schema", wx.OK | wx.ICON_INFORMATION)
-                dlg.ShowModal(); dlg.Destroy(); tolk.speak(f"Schema for table {table_name}: {schema}")
-            else: wx.MessageBox(f"Could not retrieve schema for table '{table_name}'.", "Error", wx.OK | wx.ICON_ERROR); tolk.speak("Could not retrieve schema.")
-        except sqlite3.Error as e: wx.MessageBox(f"Database error: {e}", "Error", wx.OK | wx.ICON_ERROR); tolk.speak(f"Database error: {e}")
+                dlg.ShowModal(); dlg.Destroy(); self.speech.speak(f"Schema for table {table_name}: {schema}")
+            else: wx.MessageBox(f"Could not retrieve schema for table '{table_name}'.", "Error", wx.OK | wx.ICON_ERROR); self.speech.speak("Could not retrieve schema.")
+        except sqlite3.Error as e: wx.MessageBox(f"Database error: {e}", "Error", wx.OK | wx.ICON_ERROR); self.speech.speak(f"Database error: {e}")
+    def on_grid_col_size(self, event: gridlib.GridSizeEvent):
+        if self._column_sizer: self._column_sizer.manual_cols.add(event.GetRowOrCol())
+        event.Skip()
+    def _save_column_widths(self):
+        if self._column_sizer: self._column_sizer.save(); self._column_sizer = None
+    def on_grid_col_sort(self, event: gridlib.GridEvent): self._cycle_sort(event.GetCol())
+    def on_sort_current_column(self, event: wx.CommandEvent): self._cycle_sort(self.data_grid.GetGridCursorCol())
+    def _cycle_sort(self, col: int):
+        """Moves a column through ascending, descending and unsorted."""
+        if not self.grid_table or col < 0: return
+        sort = self.grid_table.sort
+        if not sort or sort[0] != col: new_sort: Optional[Tuple[int, bool]] = (col, False)
+        elif not sort[1]: new_sort = (col, True)
+        else: new_sort = None
+        self._apply_view(new_sort, self.grid_table.filters)
+    def on_apply_filter(self, event: wx.CommandEvent):
+        if not self.grid_table: return
+        col, op = self.filter_column.GetSelection(), self.filter_op.GetStringSelection()
+        if col < 0 or not op: return
+        self._apply_view(self.grid_table.sort, [(col, op, self.filter_value.GetValue())])
+    def on_clear_filter(self, event: wx.CommandEvent):
+        if self.grid_table: self.filter_value.SetValue(""); self._apply_view(self.grid_table.sort, [])
+    def on_clear_view(self, event: wx.CommandEvent):
+        if self.grid_table: self.filter_value.SetValue(""); self._apply_view(None, [])
+    def _apply_view(self, sort: Optional[Tuple[int, bool]], filters: list):
+        """Re-queries the grid with a new ORDER BY/WHERE and announces whether an index serves it."""
+        if not self.grid_table or self._check_unsaved_changes() == wx.ID_CANCEL: return
+        if self.data_grid.IsCellEditControlShown(): self.data_grid.HideCellEditControl()
+        table = self.grid_table
+        try: table.set_view(sort, filters)
+        except sqlite3.Error as e: wx.MessageBox(f"Database error: {e}", "Error", wx.OK | wx.ICON_ERROR); self.speech.speak(f"Database error: {e}"); return
+        if sort: self.data_grid.SetSortingColumn(sort[0], not sort[1])
+        else: self.data_grid.UnsetSortingColumn()
+        rows, cols = table.GetNumberRows(), table.GetNumberCols()
+        self.data_grid.ForceRefresh()
+        if rows: self.data_grid.GoToCell(0, max(0, self.data_grid.GetGridCursorCol()))
+        parts = []
+        if sort: parts.append(f"Sorted by {table.col_names[sort[0]]} {'descending' if sort[1] else 'ascending'}, {'using an index' if table.is_index_backed(sort[0]) else 'without an index'}.")
+        if filters:
+            col, op, value = filters[0]; backed = "using an index" if table.filter_is_index_backed() else "without an index"
+            parts.append(f"Filtered where {table.col_names[col]} {op}{' ' + str(value) if FILTER_OPERATORS[op][1] else ''}, {backed}.")
+        message = " ".join(parts) or "Sort and filter cleared."
+        self._update_statusbar(message, None, f"{rows} rows, {cols} columns"); self.speech.speak(f"{message} {rows} rows.")
+        if sort and not table.is_index_backed(sort[0]): self._offer_index(sort[0], "Sorting")
+        elif filters and filters[0][1] in INDEXABLE_OPERATORS and not table.filter_is_index_backed(): self._offer_index(filters[0][0], "Filtering")
+    def _offer_index(self, col: int, action: str):
+        table = self.grid_table
+        if not table or table.row_count < INDEX_SUGGESTION_ROWS: return
+        if not self.edit_mode: self.speech.speak("Enable editing to create an index for this column."); return
+        name = table.col_names[col]
+        dlg = wx.MessageDialog(self, f"{action} by {name} scans all {table.row_count:,} rows. Create an index on {name} to speed it up?", "Create Index", wx.YES_NO | wx.ICON_QUESTION)
+        result = dlg.ShowModal(); dlg.Destroy()
+        if result != wx.ID_YES: return
+        try: index_name = table.create_index(col)
+        except sqlite3.Error as e: wx.MessageBox(f"Could not create index: {e}", "Error", wx.OK | wx.ICON_ERROR); return
+        self._update_statusbar(f"Created index {index_name}."); self.speech.speak(f"Created index {index_name}.")
+    def on_performance(self, event: wx.CommandEvent):
+        with PerformanceDialog(self, profiler) as dlg: dlg.ShowModal()
+    def on_find(self, event: wx.CommandEvent):
+        if not self.grid_table: return
+        text, col = self._find_state
+        with FindDialog(self, self.grid_table.col_names, text, col) as dlg:
+            if dlg.ShowModal() != wx.ID_OK or not dlg.search_text: return
+            self._find_state = (dlg.search_text, dlg.column); forward = dlg.forward
+        self._find(forward)
+    def _find(self, forward: bool):
+        text, col = self._find_state
+        if not self.grid_table: return
+        if not text: self.on_find(None); return
+        try: row = self.grid_table.find(text, col, self.data_grid.GetGridCursorRow(), forward)
+        except sqlite3.Error as e: wx.MessageBox(f"Database error: {e}", "Error", wx.OK | wx.ICON_ERROR); return
+        if row is None: self.speech.speak(f"{text} not found."); self._update_statusbar(f"'{text}' not found."); return
+        if col is None:
+            needle = text.lower(); cols = range(self.grid_table.GetNumberCols())
+            col = next((c for c in cols if needle in self.grid_table.GetValue(row, c).lower()), max(0, self.data_grid.GetGridCursorCol()))
+        self.data_grid.SetGridCursor(row, col); self.data_grid.MakeCellVisible(row, col)
     def on_grid_cell_changing(self, event: gridlib.GridEvent):
         if not self.edit_mode: event.Veto(); return
         event.Skip()
@@ -246,17 +538,20 @@ class SQLiteEditor(wx.Frame):
         row, col = event.GetRow(), event.GetCol()
         if (row, col) == self.last_spoken_cell: event.Skip(); return
         self.last_spoken_cell = (row, col)
-        if self.grid_table:
-            col_name = self.grid_table.GetColLabelValue(col); data_type = self.grid_table.get_column_type(col)
-            value_str = self.grid_table.GetValue(row, col) or "empty"
-            tolk.speak(f"{col_name}, Type {data_type}, Row {row + 1}, {value_str}")
+        table = self.grid_table
+        # Deferred and coalesced: while a key repeats only the cell the cursor settles on is formatted and read.
+        if table: self.speech.speak_later(lambda: self._announcements.get(table.generation, (row, col), lambda: self._cell_announcement(table, row, col)) if table is self.grid_table else "")
         event.Skip()
+    def _cell_announcement(self, table: SQLiteGridTable, row: int, col: int) -> str:
+        if not (0 <= row < table.GetNumberRows() and 0 <= col < table.GetNumberCols()): return ""
+        col_name = table.GetColLabelValue(col); data_type = table.get_column_type(col); value_str = table.GetValue(row, col) or "empty"
+        return f"{col_name}, Type {data_type}, Row {row + 1}, {value_str}"
     def on_grid_editor_created(self, event: gridlib.GridEvent):
         row, col = event.GetRow(), event.GetCol()
         if self.grid_table:
             col_name = self.grid_table.GetColLabelValue(col); value_str = self.data_grid.GetCellValue(row, col) or "empty"
-            tolk.speak(f"Editing {col_name}. Current value: {value_str}")
+            self.speech.speak(f"Editing {col_name}. Current value: {value_str}")
         event.Skip()
     def on_grid_key_down(self, event: wx.KeyEvent):
-        if event.GetKeyCode() == wx.WXK_F2 and not self.edit_mode: tolk.speak("Edit mode is disabled."); return
+        if event.GetKeyCode() == wx.WXK_F2 and not self.edit_mode: self.speech.speak("Edit mode is disabled."); return
         event.Skip()
\ No newline at end of file
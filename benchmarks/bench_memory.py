@@ -0,0 +1,59 @@
+"""
+Memory benchmark of the page cache on a wide numeric table: fetches every row in PAGE_SIZE
+pages, keeps them the way the table caches them, and reports the memory still held per row
+once the fetched tuples are gone.
+
+"before" keeps each page as a list of key tuples and a list of row lists (one boxed object per
+cell), as SQLiteGridTable did before the columnar store; "after" keeps CellPages.
+
+Usage: python benchmarks/bench_memory.py [rows] [int_columns] [real_columns]
+"""
+import gc
+import os
+import sys
+import sqlite3
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cell_store import INTEGER, CellPage, storage_kind
+
+PAGE_SIZE = 256  # grid_components.PAGE_SIZE; not imported so the benchmark runs without wx
+
+def build_db(rows: int, int_cols: int, real_cols: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(':memory:')
+    columns = [f"i{c} INTEGER" for c in range(int_cols)] + [f"r{c} REAL" for c in range(real_cols)]
+    conn.execute(f"CREATE TABLE bench (id INTEGER PRIMARY KEY, {', '.join(columns)})")
+    conn.executemany(f"INSERT INTO bench VALUES ({', '.join('?' * (1 + int_cols + real_cols))})",
+                     ((i, *(i * 1000 + c for c in range(int_cols)), *(i / (c + 3) for c in range(real_cols))) for i in range(rows)))
+    conn.commit(); return conn
+
+def legacy_page(rows, width):
+    return [tuple(r[:width]) for r in rows], [list(r[width:]) for r in rows]
+
+def columnar_page(rows, kinds): return CellPage(rows, [INTEGER], kinds)
+
+def measure(conn: sqlite3.Connection, build) -> int:
+    """Bytes still allocated after caching every page of the table with build(rows)."""
+    gc.collect(); tracemalloc.start(); pages = []
+    cursor = conn.execute("SELECT rowid, * FROM bench ORDER BY rowid")
+    while True:
+        rows = cursor.fetchmany(PAGE_SIZE)
+        if not rows: break
+        pages.append(build(rows))
+    del rows, cursor; gc.collect()
+    held = tracemalloc.get_traced_memory()[0]; tracemalloc.stop()
+    return held
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    int_cols = int(sys.argv[2]) if len(sys.argv) > 2 else 25; real_cols = int(sys.argv[3]) if len(sys.argv) > 3 else 25
+    conn = build_db(rows, int_cols, real_cols)
+    kinds = [storage_kind(row[2]) for row in conn.execute("PRAGMA table_info(bench)")]
+    before = measure(conn, lambda page: legacy_page(page, 1)); after = measure(conn, lambda page: columnar_page(page, kinds))
+    print(f"{rows} rows x {len(kinds)} cols ({1 + int_cols} INTEGER, {real_cols} REAL), {PAGE_SIZE} rows per page")
+    print(f"before: {before / 2**20:.1f} MiB ({before / rows:.0f} bytes/row)")
+    print(f"after:  {after / 2**20:.1f} MiB ({after / rows:.0f} bytes/row)  x{before / after:.2f} smaller")
+
+if __name__ == '__main__':
+    main()
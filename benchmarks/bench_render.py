@@ -0,0 +1,59 @@
+"""
+Micro-benchmark of grid repaint cost: scrolls a viewport through a synthetic table and
+calls GetValue for every visible cell, the way wx does on each repaint.
+
+"before" re-derives the column type, label and boolean heuristics on every call, as
+GetValue did before the per-column plan; "after" is the current SQLiteGridTable.GetValue.
+Both read cells through the same page cache, so the difference is the per-cell overhead.
+
+Usage: python benchmarks/bench_render.py [rows] [viewport_rows]
+"""
+import os
+import sys
+import sqlite3
+import time
+from functools import partial
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wx
+from grid_components import PAGE_SIZE, SQLiteGridTable
+
+COLUMNS = [('id', 'INTEGER PRIMARY KEY'), ('name', 'TEXT'), ('price', 'REAL'), ('qty', 'INTEGER'), ('is_active', 'INTEGER'),
+           ('has_stock', 'INT'), ('flag', 'BOOLEAN'), ('notes', 'TEXT'), ('ratio', 'DOUBLE'), ('created', 'TEXT')]
+
+def legacy_get_value(table: SQLiteGridTable, row: int, col: int) -> str:
+    try:
+        value = table._cell_value(row, col); col_type = table.column_info[col][1].upper(); col_name = table.GetColLabelValue(col).lower()
+        if 'BOOL' in col_type or ('INT' in col_type and (col_name.startswith('is_') or col_name.startswith('has_'))): return "1" if value else "0"
+        return str(value) if value is not None else ''
+    except IndexError: return ''
+
+def build_db(rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(':memory:')
+    conn.execute(f"CREATE TABLE bench ({', '.join(f'{n} {t}' for n, t in COLUMNS)})")
+    conn.executemany("INSERT INTO bench VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                     ((i, f"item {i}", i * 0.25, i % 97, i % 2, i % 3 == 0, i % 5 == 0, None if i % 4 else "note", i / 7, "2024-01-01") for i in range(rows)))
+    conn.commit(); return conn
+
+def scroll(get_value, table: SQLiteGridTable, viewport: int) -> float:
+    cols = table.GetNumberCols(); start = time.perf_counter()
+    for top in range(0, table.GetNumberRows(), viewport):
+        for row in range(top, min(top + viewport, table.GetNumberRows())):
+            for col in range(cols): get_value(row, col)
+    return time.perf_counter() - start
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000; viewport = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    app = wx.App(False)
+    table = SQLiteGridTable(build_db(rows), 'bench', max_cached_pages=rows // PAGE_SIZE + 1)
+    scroll(table.GetValue, table, viewport)  # warm the page cache so both runs measure formatting only
+    cells = table.GetNumberRows() * table.GetNumberCols()
+    before = scroll(partial(legacy_get_value, table), table, viewport); after = scroll(table.GetValue, table, viewport)
+    print(f"{rows} rows x {table.GetNumberCols()} cols, viewport {viewport} rows")
+    print(f"before: {before:.3f}s ({before / cells * 1e6:.2f} us/cell)")
+    print(f"after:  {after:.3f}s ({after / cells * 1e6:.2f} us/cell)  speedup x{before / after:.2f}")
+    app.Destroy()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Headless benchmark suite: generates synthetic databases (see make_db.py) and drives
+SQLiteGridTable the way the grid does, reporting latency and memory for open, scroll,
+edit, save and export, plus the slowest queries recorded by the profiler.
+
+Databases are generated once into --dir and reused. Large sizes take a while to generate
+the first time (10M narrow rows is roughly a minute).
+
+Usage: python benchmarks/bench_suite.py [--rows 10000 100000] [--shapes narrow wide]
+                                        [--keys rowid pk without_rowid] [--dir DIR] [--json FILE]
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wx
+from exporter import ExportJob, ExportTarget
+from grid_components import SQLiteGridTable
+from instrumentation import profiler
+from make_db import KEYS, SHAPES, ensure
+
+VIEWPORT_ROWS = 40
+SEQUENTIAL_VIEWPORTS = 50   # scrolled one after another from the top
+RANDOM_VIEWPORTS = 50       # jumps to random positions, like dragging the scroll thumb
+EDITS = 500
+
+def _ms(seconds: float) -> float: return round(seconds * 1000, 3)
+
+def _paint(table: SQLiteGridTable, top: int) -> float:
+    start = time.perf_counter(); cols = table.GetNumberCols()
+    for row in range(top, min(top + VIEWPORT_ROWS, table.GetNumberRows())):
+        for col in range(cols): table.GetValue(row, col)
+    return time.perf_counter() - start
+
+def _scroll_tops(rows: int, rng: random.Random) -> List[int]:
+    return [i * VIEWPORT_ROWS for i in range(SEQUENTIAL_VIEWPORTS)] + [rng.randrange(max(1, rows - VIEWPORT_ROWS)) for _ in range(RANDOM_VIEWPORTS)]
+
+def measure_memory(path: str, tops: List[int]) -> float:
+    """Peak Python allocations (MiB) while opening and scrolling, in a separate pass so tracing doesn't skew the timings."""
+    conn = sqlite3.connect(path); tracemalloc.start()
+    try:
+        table = SQLiteGridTable(conn, 'bench')
+        for top in tops: _paint(table, top)
+        return round(tracemalloc.get_traced_memory()[1] / 2**20, 2)
+    finally: tracemalloc.stop(); conn.close()
+
+def run_case(path: str, rng: random.Random) -> Dict[str, Any]:
+    conn = sqlite3.connect(path); profiler.clear(); result: Dict[str, Any] = {}
+    try:
+        start = time.perf_counter(); table = SQLiteGridTable(conn, 'bench'); result['open_ms'] = _ms(time.perf_counter() - start)
+        rows = table.GetNumberRows(); result['rows'] = rows; result['cols'] = table.GetNumberCols()
+        tops = _scroll_tops(rows, rng)
+        paints = sorted(_paint(table, top) for top in tops)
+        result['scroll_avg_ms'] = _ms(sum(paints) / len(paints)); result['scroll_p95_ms'] = _ms(paints[int(len(paints) * 0.95) - 1]); result['scroll_max_ms'] = _ms(paints[-1])
+        col = next(c for c in range(table.GetNumberCols()) if c not in table._key_col_indexes and table.get_column_type(c) in ('INTEGER', 'REAL'))
+        start = time.perf_counter()
+        for _ in range(EDITS):
+            row = rng.randrange(rows); table.SetValue(row, col, str((table._cell_value(row, col) or 0) + 1))  # always a real change, even on a reused database
+        result['edit_us'] = round((time.perf_counter() - start) / EDITS * 1e6, 2)
+        start = time.perf_counter(); ok, message = table.apply_changes(); result['save_ms'] = _ms(time.perf_counter() - start)
+        if not ok: raise RuntimeError(message)
+        result['cache_kib'] = round(table.cache_bytes() / 1024, 1)
+        with tempfile.TemporaryDirectory() as out_dir:
+            query, params = table.view_query(); output = os.path.join(out_dir, "bench.csv")
+            job = ExportJob(path, [ExportTarget('bench', query, params, output)], 'csv', False, lambda result: None, lambda error: None)
+            start = time.perf_counter(); exported = job.work(conn)[0]; elapsed = time.perf_counter() - start
+        result['export_ms'] = _ms(elapsed); result['export_rows_per_sec'] = round(exported.rows / max(elapsed, 1e-9))
+        result['slowest'] = [a.as_dict() for a in profiler.summary()[:5]]
+    finally: conn.close()
+    result['peak_python_mib'] = measure_memory(path, tops)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless SQLiteGridTable benchmarks")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000]); parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument('--keys', nargs='+', choices=KEYS, default=KEYS); parser.add_argument('--dir', default=os.path.join(tempfile.gettempdir(), "sqlite-editor-bench"))
+    parser.add_argument('--json', help="also write the full results, including slow queries and their plans, to this file"); parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(); app = wx.App(False); rng = random.Random(args.seed); results: List[Dict[str, Any]] = []
+    header = f"{'case':<32}{'open ms':>9}{'scroll avg':>11}{'p95':>8}{'edit us':>9}{'save ms':>9}{'export ms':>10}{'cache KiB':>10}{'peak MiB':>9}"
+    print(header); print("-" * len(header))
+    for rows in args.rows:
+        for shape in args.shapes:
+            for key in args.keys:
+                case = f"{shape}/{key}/{rows}"; result = {'case': case, **run_case(ensure(args.dir, shape, rows, key), rng)}; results.append(result)
+                print(f"{case:<32}{result['open_ms']:>9.1f}{result['scroll_avg_ms']:>11.2f}{result['scroll_p95_ms']:>8.2f}{result['edit_us']:>9.1f}"
+                      f"{result['save_ms']:>9.1f}{result['export_ms']:>10.1f}{result['cache_kib']:>10.0f}{result['peak_python_mib']:>9.1f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as out: json.dump({'created': time.time(), 'sqlite': sqlite3.sqlite_version, 'results': results}, out, indent=2)
+    app.Destroy()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""
+Generates synthetic SQLite databases for the benchmarks: one table named "bench" in a narrow
+or wide shape, keyed by a plain rowid, an INTEGER PRIMARY KEY or a composite WITHOUT ROWID key.
+
+Usage: python benchmarks/make_db.py OUTPUT.db [--shape narrow|wide] [--rows N] [--key rowid|pk|without_rowid]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from itertools import islice
+from typing import Iterator, List, Tuple
+
+SHAPES = {
+    'narrow': [('name', 'TEXT'), ('qty', 'INTEGER'), ('price', 'REAL')],
+    'wide': [(f"i{c}", 'INTEGER') for c in range(20)] + [(f"r{c}", 'REAL') for c in range(20)] + [(f"t{c}", 'TEXT') for c in range(10)],
+}
+KEYS = ['rowid', 'pk', 'without_rowid']
+CHUNK = 50_000
+WORDS = "alpha bravo charlie delta echo foxtrot golf hotel india juliet kilo lima mike november oscar papa".split()
+
+def db_path(directory: str, shape: str, rows: int, key: str) -> str: return os.path.join(directory, f"bench_{shape}_{key}_{rows}.db")
+
+def _columns(shape: str, key: str) -> List[Tuple[str, str]]:
+    if key == 'pk': return [('id', 'INTEGER PRIMARY KEY')] + SHAPES[shape]
+    if key == 'without_rowid': return [('region', 'TEXT NOT NULL'), ('seq', 'INTEGER NOT NULL')] + SHAPES[shape]
+    return SHAPES[shape]
+
+def _values(kind: str, i: int, rng: random.Random):
+    if kind == 'INTEGER': return rng.randrange(1_000_000)
+    if kind == 'REAL': return rng.random() * 1000
+    if rng.random() < 0.05: return None
+    return " ".join(rng.choice(WORDS) for _ in range(1 + i % 6))
+
+def _rows(shape: str, rows: int, key: str, seed: int) -> Iterator[tuple]:
+    rng = random.Random(seed); kinds = [t for _, t in SHAPES[shape]]
+    for i in range(rows):
+        values = tuple(_values(kind, i, rng) for kind in kinds)
+        if key == 'pk': yield (i + 1,) + values
+        elif key == 'without_rowid': yield (WORDS[i % len(WORDS)], i // len(WORDS)) + values
+        else: yield values
+
+def generate(path: str, shape: str = 'narrow', rows: int = 10_000, key: str = 'rowid', seed: int = 0) -> str:
+    if os.path.exists(path): os.remove(path)
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF"); conn.execute("PRAGMA synchronous = OFF")
+        columns = _columns(shape, key)
+        suffix = ", PRIMARY KEY (region, seq)) WITHOUT ROWID" if key == 'without_rowid' else ")"
+        conn.execute(f"CREATE TABLE bench ({', '.join(f'{n} {t}' for n, t in columns)}{suffix}")
+        insert = f"INSERT INTO bench VALUES ({', '.join('?' * len(columns))})"; source = _rows(shape, rows, key, seed)
+        conn.execute("BEGIN")
+        while True:
+            chunk = list(islice(source, CHUNK))
+            if not chunk: break
+            conn.executemany(insert, chunk)
+        conn.execute("COMMIT")
+    finally: conn.close()
+    return path
+
+def ensure(directory: str, shape: str, rows: int, key: str) -> str:
+    """Returns the path of a generated database, generating it only if it doesn't exist yet."""
+    os.makedirs(directory, exist_ok=True); path = db_path(directory, shape, rows, key)
+    return path if os.path.exists(path) else generate(path, shape, rows, key)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output'); parser.add_argument('--shape', choices=list(SHAPES), default='narrow')
+    parser.add_argument('--rows', type=int, default=10_000); parser.add_argument('--key', choices=KEYS, default='rowid')
+    args = parser.parse_args(); start = time.perf_counter()
+    generate(args.output, args.shape, args.rows, args.key)
+    print(f"{args.output}: {args.rows} {args.shape} rows keyed by {args.key} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import sys
+from array import array
+from typing import Any, List, Optional, Sequence
+
+# Storage kinds, chosen per column from SQLite's type affinity rules.
+INTEGER, REAL, TEXT, BLOB, OBJECT = 'integer', 'real', 'text', 'blob', 'object'
+
+def storage_kind(declared_type: str) -> str:
+    """Maps a declared column type to how its cells are packed, following SQLite's affinity rules."""
+    t = declared_type.upper()
+    if 'INT' in t: return INTEGER
+    if 'CHAR' in t or 'CLOB' in t or 'TEXT' in t: return TEXT
+    if not t or 'BLOB' in t: return BLOB
+    if 'REAL' in t or 'FLOA' in t or 'DOUB' in t: return REAL
+    return OBJECT
+
+class ObjectColumn:
+    """Fallback: one boxed Python object per cell, for columns whose values don't fit a packed layout."""
+    __slots__ = ('values',)
+    def __init__(self, values: List[Any]): self.values = values
+    def __len__(self) -> int: return len(self.values)
+    def value(self, i: int) -> Any: return self.values[i]
+    def set(self, i: int, value: Any) -> bool: self.values[i] = value; return True
+    def nbytes(self) -> int: return sys.getsizeof(self.values) + sum(sys.getsizeof(v) for v in self.values if v is not None)
+
+class NumericColumn:
+    """Cells packed in a typed array; a bitmap marks NULLs, whose slots hold 0."""
+    __slots__ = ('data', 'nulls')
+    def __init__(self, data: array, nulls: Optional[bytearray]): self.data = data; self.nulls = nulls
+    @classmethod
+    def build(cls, typecode: str, value_type: type, values: Sequence[Any]) -> Optional["NumericColumn"]:
+        nulls = None; packed = array(typecode, bytes(array(typecode).itemsize * len(values)))
+        for i, value in enumerate(values):
+            if value is None:
+                if nulls is None: nulls = bytearray((len(values) + 7) >> 3)
+                nulls[i >> 3] |= 1 << (i & 7)
+            elif type(value) is value_type: packed[i] = value
+            else: return None
+        return cls(packed, nulls)
+    def __len__(self) -> int: return len(self.data)
+    def value(self, i: int) -> Any:
+        if self.nulls is not None and self.nulls[i >> 3] >> (i & 7) & 1: return None
+        return self.data[i]
+    def set(self, i: int, value: Any) -> bool:
+        if value is None:
+            if self.nulls is None: self.nulls = bytearray((len(self.data) + 7) >> 3)
+            self.nulls[i >> 3] |= 1 << (i & 7); self.data[i] = 0; return True
+        if type(value) is not type(self.data[i]): return False
+        try: self.data[i] = value
+        except OverflowError: return False
+        if self.nulls is not None: self.nulls[i >> 3] &= ~(1 << (i & 7))
+        return True
+    def nbytes(self) -> int: return sys.getsizeof(self.data) + (len(self.nulls) if self.nulls is not None else 0)
+
+class SliceColumn:
+    """
+    Text or blob cells concatenated into one str/bytes object and addressed by an offset array,
+    so a page holds one string per column instead of one per cell. NULLs are zero-length slices
+    flagged in a bitmap.
+    """
+    __slots__ = ('data', 'offsets', 'nulls')
+    def __init__(self, data: Any, offsets: array, nulls: Optional[bytearray]): self.data = data; self.offsets = offsets; self.nulls = nulls
+    @classmethod
+    def build(cls, value_type: type, values: Sequence[Any]) -> Optional["SliceColumn"]:
+        nulls = None; parts = []; offsets = array('q', [0]); end = 0
+        for i, value in enumerate(values):
+            if value is None:
+                if nulls is None: nulls = bytearray((len(values) + 7) >> 3)
+                nulls[i >> 3] |= 1 << (i & 7)
+            elif type(value) is value_type: parts.append(value); end += len(value)
+            else: return None
+            offsets.append(end)
+        return cls(value_type().join(parts), offsets, nulls)
+    def __len__(self) -> int: return len(self.offsets) - 1
+    def value(self, i: int) -> Any:
+        if self.nulls is not None and self.nulls[i >> 3] >> (i & 7) & 1: return None
+        return self.data[self.offsets[i]:self.offsets[i + 1]]
+    def set(self, i: int, value: Any) -> bool: return False  # rebuilt by the page; pages are small
+    def nbytes(self) -> int: return sys.getsizeof(self.data) + sys.getsizeof(self.offsets) + (len(self.nulls) if self.nulls is not None else 0)
+
+_PACKERS = {
+    INTEGER: lambda values: NumericColumn.build('q', int, values),
+    REAL: lambda values: NumericColumn.build('d', float, values),
+    TEXT: lambda values: SliceColumn.build(str, values),
+    BLOB: lambda values: SliceColumn.build(bytes, values),
+}
+
+def pack_column(kind: str, values: List[Any]) -> Any:
+    """Packs one column of a page in its kind's layout, or boxes it when any value doesn't fit."""
+    packer = _PACKERS.get(kind)
+    return (packer(values) if packer else None) or ObjectColumn(values)
+
+def column_values(column: Any) -> List[Any]: return [column.value(i) for i in range(len(column))]
+
+class CellPage:
+    """
+    One cached page of rows stored column-wise. Row keys are packed the same way as
+    the columns; key(i) and row(i) rebuild a row's tuple or list only when asked.
+    """
+    __slots__ = ('keys', 'columns', 'kinds', 'length')
+    def __init__(self, rows: Sequence[Sequence[Any]], key_kinds: Sequence[str], kinds: Sequence[str]):
+        width = len(key_kinds); self.length = len(rows); self.kinds = kinds
+        self.keys = [pack_column(kind, [r[c] for r in rows]) for c, kind in enumerate(key_kinds)]
+        self.columns = [pack_column(kind, [r[width + c] for r in rows]) for c, kind in enumerate(kinds)]
+    def __len__(self) -> int: return self.length
+    def key(self, i: int) -> tuple: return tuple(column.value(i) for column in self.keys)
+    def value(self, i: int, col: int) -> Any: return self.columns[col].value(i)
+    def row(self, i: int) -> List[Any]: return [column.value(i) for column in self.columns]
+    def nbytes(self) -> int: return sum(column.nbytes() for column in self.keys + self.columns)
+    def set(self, i: int, col: int, value: Any):
+        column = self.columns[col]
+        if not column.set(i, value):
+            values = column_values(column); values[i] = value; self.columns[col] = pack_column(self.kinds[col], values)
@@ -0,0 +1,76 @@
+import wx
+import wx.grid as gridlib
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from cell_store import CellPage
+from connection import config_key, database_key
+from grid_components import SAMPLE_LONGEST, SQLiteGridTable
+
+MEASURE_CHARS = 200       # longer text is measured by its prefix; the column is capped anyway
+MIN_COL_WIDTH = 40
+MAX_COL_WIDTH = 400
+CELL_PADDING = 12
+
+class ColumnSizer:
+    """
+    Sizes a table's columns from the header, the first page and the longest values sampled
+    with the table snapshot rather than every cell, then widens them as later pages load.
+    Widths are saved per table in wx.Config, so reopening a table restores its layout
+    without measuring anything.
+    """
+    def __init__(self, grid: gridlib.Grid, table: SQLiteGridTable, config: wx.ConfigBase, db_path: str):
+        self.grid = grid; self.table = table; self.config = config
+        self._group = f"/ColumnWidths/{database_key(db_path)}/{config_key(table.table_name)}"
+        self._pending: List[CellPage] = []; self._measure: Optional[Callable[[str], int]] = None
+        self.manual_cols: Set[int] = set()  # columns the user resized; refinement leaves them alone
+    def apply(self):
+        """Restores saved widths, or measures a sample and starts refining as pages load."""
+        if self._restore(): return
+        columns = self.table.GetNumberCols(); rows = min(self.table.GetNumberRows(), self.table.page_size)
+        first_page: List[List[str]] = [[self.table.GetValue(row, col) for row in range(rows)] for col in range(columns)]
+        samples = self.table.samples or [[] for _ in range(columns)]
+        label_measure = self._text_measure(self.grid.GetLabelFont())
+        for col in range(columns):
+            formatter = self.table.column_plan[col].formatter
+            texts = first_page[col] + [formatter(value) for value in samples[col]]
+            width = max(label_measure(self.table.GetColLabelValue(col)), self._widest(texts))
+            self.grid.SetColSize(col, self._clamp(width))
+        self.table.page_loaded = self._on_page_loaded
+    def _restore(self) -> bool:
+        names = self.config.Read(f"{self._group}/Columns", "")
+        if names != "\t".join(self.table.col_names): return False
+        try: widths = [int(w) for w in self.config.Read(f"{self._group}/Widths", "").split(",")]
+        except ValueError: return False
+        if len(widths) != self.table.GetNumberCols(): return False
+        for col, width in enumerate(widths): self.grid.SetColSize(col, width)
+        return True
+    def save(self):
+        if self.table.page_loaded == self._on_page_loaded: self.table.page_loaded = None
+        self.config.Write(f"{self._group}/Columns", "\t".join(self.table.col_names))
+        self.config.Write(f"{self._group}/Widths", ",".join(str(self.grid.GetColSize(col)) for col in range(self.table.GetNumberCols())))
+    def _on_page_loaded(self, cells: CellPage):
+        # Pages load while the grid paints; resizing is deferred until the paint is over.
+        self._pending.append(cells)
+        if len(self._pending) == 1: wx.CallAfter(self._refine)
+    def _refine(self):
+        """Widens (never narrows) columns whose longest value in the newly loaded pages doesn't fit."""
+        pages, self._pending = self._pending, []
+        if self.table.page_loaded != self._on_page_loaded: return
+        changed = False
+        for col, plan in enumerate(self.table.column_plan):
+            current = self.grid.GetColSize(col)
+            if current >= MAX_COL_WIDTH or col in self.manual_cols: continue
+            longest = max((plan.formatter(page.value(i, col)) for page in pages for i in range(page.length)), key=len, default="")
+            width = self._clamp(self._widest([longest]))
+            if width > current: self.grid.SetColSize(col, width); changed = True
+        if changed: self.grid.ForceRefresh()
+    def _widest(self, texts: Iterable[str]) -> int:
+        if self._measure is None: self._measure = self._text_measure(self.grid.GetDefaultCellFont())
+        longest: Dict[int, str] = {}
+        for text in texts:
+            text = text.split("\n", 1)[0][:MEASURE_CHARS]; longest.setdefault(len(text), text)
+        # Measuring only the few longest strings keeps this to a handful of text extent calls per column.
+        return max((self._measure(longest[n]) for n in sorted(longest)[-SAMPLE_LONGEST:]), default=0)
+    def _text_measure(self, font: wx.Font) -> Callable[[str], int]: return lambda text: self.grid.GetFullTextExtent(text, font)[0]
+    @staticmethod
+    def _clamp(width: int) -> int: return max(MIN_COL_WIDTH, min(MAX_COL_WIDTH, width + CELL_PADDING))
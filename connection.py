@@ -0,0 +1,63 @@
+import hashlib
+import os
+import pathlib
+import sqlite3
+from typing import NamedTuple
+
+import wx
+
+TEMP_STORE_MODES = ['DEFAULT', 'FILE', 'MEMORY']
+
+class ConnectionProfile(NamedTuple):
+    """Per-database connection tuning, applied as PRAGMAs every time the database is opened."""
+    cache_size_kib: int = 64 * 1024        # page cache per connection (PRAGMA cache_size = -KiB)
+    mmap_size_mib: int = 256               # memory-mapped I/O window; 0 turns mmap off
+    temp_store: str = 'MEMORY'             # where sorts and temporary indexes live
+    busy_timeout_ms: int = 5000            # how long to wait on another process's lock
+    wal: bool = False                      # switch the file to WAL when opened for writing (persistent; unsupported on network shares)
+    immutable: bool = False                # browse without any locking; only safe for files nothing else writes
+
+def database_uri(path: str, read_only: bool, immutable: bool = False) -> str:
+    """Builds the file: URI for a database; read-only URIs let browsing coexist with another process's writes."""
+    uri = pathlib.Path(os.path.abspath(path)).as_uri()
+    if not read_only: return uri + "?mode=rw"
+    return uri + ("?mode=ro&immutable=1" if immutable else "?mode=ro")
+
+def apply_profile(conn: sqlite3.Connection, profile: ConnectionProfile, read_only: bool):
+    conn.execute(f"PRAGMA busy_timeout = {int(profile.busy_timeout_ms)}")
+    conn.execute(f"PRAGMA cache_size = {-int(profile.cache_size_kib)}")
+    conn.execute(f"PRAGMA mmap_size = {int(profile.mmap_size_mib) * 1024 * 1024}")
+    conn.execute(f"PRAGMA temp_store = {profile.temp_store if profile.temp_store in TEMP_STORE_MODES else 'DEFAULT'}")
+    # journal_mode=WAL writes to the file header, so it can only be switched on from a writable connection.
+    if profile.wal and not read_only: conn.execute("PRAGMA journal_mode = WAL")
+
+def open_connection(path: str, profile: ConnectionProfile, read_only: bool = True, **kw) -> sqlite3.Connection:
+    """Opens a database through its URI and applies the profile. Never creates a missing file."""
+    conn = sqlite3.connect(database_uri(path, read_only, profile.immutable), uri=True, timeout=profile.busy_timeout_ms / 1000, **kw)
+    try: apply_profile(conn, profile, read_only)
+    except sqlite3.Error: conn.close(); raise
+    return conn
+
+def config_key(name: str) -> str:
+    """A wx.Config-safe key for a path or table name: config keys can't contain path separators."""
+    return hashlib.sha1(name.encode('utf-8')).hexdigest()[:16]
+
+def database_key(path: str) -> str: return config_key(os.path.abspath(path))
+
+def _profile_group(path: str) -> str: return "/Profiles/" + database_key(path)
+
+def load_profile(config: wx.ConfigBase, path: str) -> ConnectionProfile:
+    group = _profile_group(path); defaults = ConnectionProfile()
+    if not config.HasGroup(group): return defaults
+    return ConnectionProfile(
+        cache_size_kib=config.ReadInt(f"{group}/CacheSizeKiB", defaults.cache_size_kib), mmap_size_mib=config.ReadInt(f"{group}/MmapSizeMiB", defaults.mmap_size_mib),
+        temp_store=config.Read(f"{group}/TempStore", defaults.temp_store), busy_timeout_ms=config.ReadInt(f"{group}/BusyTimeoutMs", defaults.busy_timeout_ms),
+        wal=config.ReadBool(f"{group}/WAL", defaults.wal), immutable=config.ReadBool(f"{group}/Immutable", defaults.immutable))
+
+def save_profile(config: wx.ConfigBase, path: str, profile: ConnectionProfile):
+    group = _profile_group(path)
+    config.Write(f"{group}/Path", os.path.abspath(path))
+    config.WriteInt(f"{group}/CacheSizeKiB", profile.cache_size_kib); config.WriteInt(f"{group}/MmapSizeMiB", profile.mmap_size_mib)
+    config.Write(f"{group}/TempStore", profile.temp_store); config.WriteInt(f"{group}/BusyTimeoutMs", profile.busy_timeout_ms)
+    config.WriteBool(f"{group}/WAL", profile.wal); config.WriteBool(f"{group}/Immutable", profile.immutable)
+    config.Flush()
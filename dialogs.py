@@ -0,0 +1,136 @@
+import wx
+from typing import List, Optional
+
+from connection import TEMP_STORE_MODES, ConnectionProfile
+from exporter import EXPORT_FORMATS
+from instrumentation import Aggregate, Profiler
+
+EXPORT_SCOPES = [("view", "Current view"), ("table", "Whole table"), ("all", "All tables in the database")]
+
+class ExportDialog(wx.Dialog):
+    """Asks for the export format, the scope (view, table or every table) and whether to gzip the output."""
+    def __init__(self, parent, table_name: str):
+        super().__init__(parent, title=f"Export {table_name}")
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        self._formats = list(EXPORT_FORMATS)
+        self.format_box = wx.RadioBox(self, label="Format", choices=[EXPORT_FORMATS[f].label for f in self._formats], majorDimension=1, style=wx.RA_SPECIFY_COLS)
+        self.scope_box = wx.RadioBox(self, label="Rows to export", choices=[label for _, label in EXPORT_SCOPES], majorDimension=1, style=wx.RA_SPECIFY_COLS)
+        self.compress_check = wx.CheckBox(self, label="Compress with &gzip")
+        sizer.Add(self.format_box, 0, wx.EXPAND | wx.ALL, 5); sizer.Add(self.scope_box, 0, wx.EXPAND | wx.ALL, 5); sizer.Add(self.compress_check, 0, wx.ALL, 5)
+        sizer.Add(self.CreateButtonSizer(wx.OK | wx.CANCEL), 0, wx.EXPAND | wx.ALL, 5)
+        self.SetSizerAndFit(sizer); self.format_box.SetFocus()
+    @property
+    def export_format(self) -> str: return self._formats[self.format_box.GetSelection()]
+    @property
+    def scope(self) -> str: return EXPORT_SCOPES[self.scope_box.GetSelection()][0]
+    @property
+    def compress(self) -> bool: return self.compress_check.IsChecked()
+
+class ImportDialog(wx.Dialog):
+    """Asks whether to load a file into an existing table or a new one, and which load tuning to apply."""
+    def __init__(self, parent, tables: List[str], current_table: Optional[str], suggested_name: str):
+        super().__init__(parent, title="Import Data")
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        self.target_box = wx.RadioBox(self, label="Import into", choices=["Existing table", "New table"], majorDimension=1, style=wx.RA_SPECIFY_COLS)
+        self.table_choice = wx.Choice(self, choices=tables)
+        if current_table in tables: self.table_choice.SetStringSelection(current_table)
+        elif tables: self.table_choice.SetSelection(0)
+        self.new_name_label = wx.StaticText(self, label="New table &name:"); self.new_name = wx.TextCtrl(self, value=suggested_name)
+        self.fast_check = wx.CheckBox(self, label="&Fast load (synchronous off, in-memory journal while importing)")
+        self.defer_check = wx.CheckBox(self, label="&Rebuild indexes after loading instead of updating them per row")
+        self.target_box.SetSelection(0 if tables else 1); self.target_box.Enable(0, bool(tables))
+        for control in (self.target_box, self.table_choice, self.new_name_label, self.new_name, self.fast_check, self.defer_check): sizer.Add(control, 0, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(self.CreateButtonSizer(wx.OK | wx.CANCEL), 0, wx.EXPAND | wx.ALL, 5)
+        self.target_box.Bind(wx.EVT_RADIOBOX, lambda event: self._update_state()); self._update_state()
+        self.SetSizerAndFit(sizer); self.target_box.SetFocus()
+    def _update_state(self):
+        creating = self.create_table; self.table_choice.Enable(not creating); self.new_name.Enable(creating); self.new_name_label.Enable(creating)
+    @property
+    def create_table(self) -> bool: return self.target_box.GetSelection() == 1
+    @property
+    def table_name(self) -> str: return self.new_name.GetValue().strip() if self.create_table else self.table_choice.GetStringSelection()
+    @property
+    def fast_pragmas(self) -> bool: return self.fast_check.IsChecked()
+    @property
+    def defer_indexes(self) -> bool: return self.defer_check.IsChecked()
+
+class FindDialog(wx.Dialog):
+    """Asks for the text to find, the column to search (or all columns) and the direction."""
+    def __init__(self, parent, col_names: List[str], text: str = "", col: Optional[int] = None):
+        super().__init__(parent, title="Find")
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        self.text_label = wx.StaticText(self, label="Find &what:"); self.text = wx.TextCtrl(self, value=text)
+        self.column_label = wx.StaticText(self, label="&Column:"); self.column_choice = wx.Choice(self, choices=["All columns"] + list(col_names))
+        self.column_choice.SetSelection(0 if col is None else col + 1)
+        self.direction_box = wx.RadioBox(self, label="Direction", choices=["Down", "Up"], majorDimension=1, style=wx.RA_SPECIFY_ROWS)
+        for control in (self.text_label, self.text, self.column_label, self.column_choice, self.direction_box): sizer.Add(control, 0, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(self.CreateButtonSizer(wx.OK | wx.CANCEL), 0, wx.EXPAND | wx.ALL, 5)
+        self.SetSizerAndFit(sizer); self.text.SetFocus(); self.text.SelectAll()
+    @property
+    def search_text(self) -> str: return self.text.GetValue()
+    @property
+    def column(self) -> Optional[int]:
+        selection = self.column_choice.GetSelection()
+        return None if selection <= 0 else selection - 1
+    @property
+    def forward(self) -> bool: return self.direction_box.GetSelection() == 0
+
+class ConnectionDialog(wx.Dialog):
+    """Edits the PRAGMA profile a database is opened with."""
+    def __init__(self, parent, profile: ConnectionProfile):
+        super().__init__(parent, title="Connection Settings")
+        sizer = wx.BoxSizer(wx.VERTICAL); grid = wx.FlexGridSizer(2, 5, 5)
+        self.cache_size = wx.SpinCtrl(self, min=0, max=16 * 1024 * 1024, initial=profile.cache_size_kib)
+        self.mmap_size = wx.SpinCtrl(self, min=0, max=1024 * 1024, initial=profile.mmap_size_mib)
+        self.busy_timeout = wx.SpinCtrl(self, min=0, max=10 * 60 * 1000, initial=profile.busy_timeout_ms)
+        self.temp_store = wx.Choice(self, choices=TEMP_STORE_MODES); self.temp_store.SetStringSelection(profile.temp_store)
+        for label, control in (("&Page cache (KiB):", self.cache_size), ("&Memory-mapped I/O (MiB, 0 for off):", self.mmap_size), ("&Busy timeout (ms):", self.busy_timeout), ("&Temporary storage:", self.temp_store)):
+            grid.Add(wx.StaticText(self, label=label), 0, wx.ALIGN_CENTER_VERTICAL); grid.Add(control, 0, wx.EXPAND)
+        self.wal_check = wx.CheckBox(self, label="Switch the file to &write-ahead logging (WAL) when editing (not for network shares)"); self.wal_check.SetValue(profile.wal)
+        self.immutable_check = wx.CheckBox(self, label="Browse as &immutable (no locking; only for files nothing else writes)"); self.immutable_check.SetValue(profile.immutable)
+        sizer.Add(grid, 0, wx.EXPAND | wx.ALL, 5); sizer.Add(self.wal_check, 0, wx.ALL, 5); sizer.Add(self.immutable_check, 0, wx.ALL, 5)
+        sizer.Add(self.CreateButtonSizer(wx.OK | wx.CANCEL), 0, wx.EXPAND | wx.ALL, 5)
+        self.SetSizerAndFit(sizer); self.cache_size.SetFocus()
+    @property
+    def profile(self) -> ConnectionProfile:
+        return ConnectionProfile(self.cache_size.GetValue(), self.mmap_size.GetValue(), self.temp_store.GetStringSelection() or 'DEFAULT', self.busy_timeout.GetValue(), self.wal_check.IsChecked(), self.immutable_check.IsChecked())
+
+class PerformanceDialog(wx.Dialog):
+    """Shows the profiler's per-query and per-phase timings, with the query plan of the selected query."""
+    def __init__(self, parent, profiler: Profiler):
+        super().__init__(parent, title="Performance", style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.profiler = profiler; self._rows: List[Aggregate] = []
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        self.enabled_check = wx.CheckBox(self, label="&Record query timings"); self.enabled_check.SetValue(profiler.enabled)
+        self.list_label = wx.StaticText(self, label="&Queries and phases, slowest first:")
+        self.timings = wx.ListCtrl(self, style=wx.LC_REPORT | wx.LC_SINGLE_SEL, size=(760, 300))
+        for i, (heading, width) in enumerate((("Query or phase", 380), ("Calls", 60), ("Total ms", 80), ("Average ms", 80), ("Max ms", 80), ("Rows", 80))): self.timings.InsertColumn(i, heading, width=width)
+        self.details_label = wx.StaticText(self, label="&Details and query plan:"); self.details = wx.TextCtrl(self, style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_DONTWRAP, size=(760, 140))
+        buttons = wx.BoxSizer(wx.HORIZONTAL)
+        self.refresh_button = wx.Button(self, label="Re&fresh"); self.clear_button = wx.Button(self, label="C&lear"); self.save_button = wx.Button(self, label="&Save as JSON...")
+        for button in (self.refresh_button, self.clear_button, self.save_button): buttons.Add(button, 0, wx.RIGHT, 5)
+        buttons.AddStretchSpacer(); buttons.Add(wx.Button(self, wx.ID_CLOSE), 0)
+        for control, flags in ((self.enabled_check, 0), (self.list_label, 0), (self.timings, 1), (self.details_label, 0), (self.details, 0), (buttons, 0)): sizer.Add(control, flags, wx.EXPAND | wx.ALL, 5)
+        self.enabled_check.Bind(wx.EVT_CHECKBOX, lambda event: setattr(self.profiler, 'enabled', event.IsChecked()))
+        self.timings.Bind(wx.EVT_LIST_ITEM_SELECTED, self.on_select)
+        self.refresh_button.Bind(wx.EVT_BUTTON, lambda event: self.refresh()); self.clear_button.Bind(wx.EVT_BUTTON, self.on_clear); self.save_button.Bind(wx.EVT_BUTTON, self.on_save)
+        self.Bind(wx.EVT_BUTTON, lambda event: self.EndModal(wx.ID_CLOSE), id=wx.ID_CLOSE); self.SetEscapeId(wx.ID_CLOSE)
+        self.SetSizerAndFit(sizer); self.refresh(); self.timings.SetFocus()
+    def refresh(self):
+        self._rows = self.profiler.summary(); self.timings.DeleteAllItems(); self.details.Clear()
+        for i, row in enumerate(self._rows):
+            label = row.label if row.kind == 'query' else f"[{row.label}]"
+            self.timings.InsertItem(i, " ".join(label.split()))
+            for col, value in enumerate((row.calls, f"{row.seconds * 1000:.1f}", f"{row.seconds * 1000 / row.calls:.2f}", f"{row.max_seconds * 1000:.2f}", row.rows), 1): self.timings.SetItem(i, col, str(value))
+        if self._rows: self.timings.Select(0); self.timings.Focus(0)
+    def on_select(self, event: wx.ListEvent):
+        row = self._rows[event.GetIndex()]
+        plan = "\n".join(row.plan) if row.plan else "No query plan recorded."
+        self.details.SetValue(f"{row.label}\n\n{plan}" if row.kind == 'query' else f"Phase: {row.label}")
+    def on_clear(self, event: wx.CommandEvent): self.profiler.clear(); self.refresh()
+    def on_save(self, event: wx.CommandEvent):
+        with wx.FileDialog(self, "Save timings", defaultFile="performance.json", wildcard="JSON files (*.json)|*.json", style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as dlg:
+            if dlg.ShowModal() == wx.ID_CANCEL: return
+            path = dlg.GetPath()
+        try: self.profiler.dump(path)
+        except OSError as e: wx.MessageBox(f"Could not save timings: {e}", "Error", wx.OK | wx.ICON_ERROR)
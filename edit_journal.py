@@ -0,0 +1,45 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Journal entry kinds. Each entry holds enough state to be replayed in either direction.
+CELL = 'cell'            # (CELL, key, offset, col, old, new)      edit of a row that exists in the database
+NEW_CELL = 'new_cell'    # (NEW_CELL, row, col, old, new)          edit of a pending inserted row
+INSERT = 'insert'        # (INSERT, row, position)                 pending row inserted at a grid position
+DELETE = 'delete'        # (DELETE, key, offset, position)         database row hidden until save
+DELETE_NEW = 'delete_new'  # (DELETE_NEW, row, position)           pending inserted row discarded
+
+class EditJournal:
+    """
+    Records pending changes to a table as they happen, keyed by rowid or primary key.
+    Only touched cells keep their original value; a cell edited back to its original
+    value drops out of the journal, so the dirty check is a constant-time size test.
+    """
+    def __init__(self): self.undo_stack: List[tuple] = []; self.redo_stack: List[tuple] = []; self.clear()
+    def clear(self):
+        self.edits: Dict[tuple, Dict[int, Any]] = {}; self.originals: Dict[tuple, Dict[int, Any]] = {}; self.deleted: Dict[tuple, int] = {}
+        self.inserted: List[List[Any]] = []; self._edited_cells: int = 0; self.undo_stack.clear(); self.redo_stack.clear()
+    def is_dirty(self) -> bool: return bool(self._edited_cells or self.deleted or self.inserted)
+    def record(self, entry: tuple):
+        self.undo_stack.append(entry); self.redo_stack.clear()
+    def pop_undo(self) -> Optional[tuple]:
+        if not self.undo_stack: return None
+        entry = self.undo_stack.pop(); self.redo_stack.append(entry); return entry
+    def pop_redo(self) -> Optional[tuple]:
+        if not self.redo_stack: return None
+        entry = self.redo_stack.pop(); self.undo_stack.append(entry); return entry
+    def set_cell(self, key: tuple, col: int, old: Any, new: Any):
+        originals = self.originals.setdefault(key, {}); edits = self.edits.setdefault(key, {})
+        if col not in originals: originals[col] = old
+        if new == originals[col] and type(new) is type(originals[col]):
+            if col in edits: del edits[col]; self._edited_cells -= 1
+            del originals[col]
+            if not edits: del self.edits[key]; del self.originals[key]
+        else:
+            if col not in edits: self._edited_cells += 1
+            edits[col] = new
+    def apply_edits(self, key: tuple, values: List[Any]) -> List[Any]:
+        edits = self.edits.get(key)
+        if not edits: return values
+        values = list(values)
+        for col, value in edits.items(): values[col] = value
+        return values
+    def pending_updates(self) -> List[Tuple[tuple, Dict[int, Any]]]: return [(key, cols) for key, cols in self.edits.items() if key not in self.deleted]
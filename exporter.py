@@ -0,0 +1,115 @@
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import time
+from typing import IO, Any, Callable, List, NamedTuple, Optional, Sequence
+
+from connection import ConnectionProfile
+from instrumentation import profiler
+from grid_components import quote_identifier
+from workers import DatabaseWorker
+
+FETCH_CHUNK = 5000
+PROGRESS_INTERVAL = 0.5  # seconds between progress reports
+
+class ExportFormat(NamedTuple):
+    label: str
+    extension: str
+
+EXPORT_FORMATS = {
+    'csv': ExportFormat("CSV (comma separated)", 'csv'),
+    'tsv': ExportFormat("TSV (tab separated)", 'tsv'),
+    'jsonl': ExportFormat("JSON Lines", 'jsonl'),
+    'sql': ExportFormat("SQL INSERT statements", 'sql'),
+}
+
+class ExportTarget(NamedTuple):
+    """One table (or filtered view of a table) streamed into one output file."""
+    table_name: str
+    query: str
+    params: tuple
+    output_path: str
+
+class ExportProgress(NamedTuple):
+    table_name: str
+    rows: int
+    total_rows: Optional[int]
+    rows_per_sec: float
+
+def export_path(directory: str, table_name: str, fmt: str, compress: bool) -> str:
+    safe_name = "".join(ch if ch.isalnum() or ch in "-_." else "_" for ch in table_name)
+    return os.path.join(directory, f"{safe_name}.{EXPORT_FORMATS[fmt].extension}" + (".gz" if compress else ""))
+
+def _sql_literal(value: Any) -> str:
+    if value is None: return "NULL"
+    if isinstance(value, (bytes, bytearray, memoryview)): return f"X'{bytes(value).hex()}'"
+    if isinstance(value, (int, float)): return repr(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _json_value(value: Any) -> Any: return bytes(value).hex() if isinstance(value, (bytes, bytearray, memoryview)) else value
+
+class RowWriter:
+    """Writes streamed rows in one export format. Subclasses only ever see one chunk at a time."""
+    def __init__(self, out: IO[str], table_name: str, col_names: Sequence[str], create_sql: Optional[str]):
+        self.out = out; self.table_name = table_name; self.col_names = list(col_names); self.create_sql = create_sql
+    def begin(self): pass
+    def write_rows(self, rows: List[tuple]): raise NotImplementedError
+    def end(self): pass
+
+class DelimitedWriter(RowWriter):
+    delimiter = ','
+    def begin(self): self._writer = csv.writer(self.out, delimiter=self.delimiter); self._writer.writerow(self.col_names)
+    def write_rows(self, rows: List[tuple]): self._writer.writerows(rows)
+
+class TabDelimitedWriter(DelimitedWriter): delimiter = '\t'
+
+class JsonLinesWriter(RowWriter):
+    def write_rows(self, rows: List[tuple]):
+        names = self.col_names; dumps = json.dumps
+        self.out.writelines(dumps({name: _json_value(value) for name, value in zip(names, row)}, ensure_ascii=False) + "\n" for row in rows)
+
+class SqlInsertWriter(RowWriter):
+    def begin(self):
+        self.out.write("BEGIN TRANSACTION;\n")
+        if self.create_sql: self.out.write(self.create_sql.rstrip(";") + ";\n")
+        self._prefix = f"INSERT INTO {quote_identifier(self.table_name)} ({', '.join(quote_identifier(c) for c in self.col_names)}) VALUES ("
+    def write_rows(self, rows: List[tuple]):
+        prefix = self._prefix; self.out.writelines(prefix + ", ".join(map(_sql_literal, row)) + ");\n" for row in rows)
+    def end(self): self.out.write("COMMIT;\n")
+
+WRITERS = {'csv': DelimitedWriter, 'tsv': TabDelimitedWriter, 'jsonl': JsonLinesWriter, 'sql': SqlInsertWriter}
+
+class ExportJob(DatabaseWorker):
+    """
+    Streams query results straight from SQLite into export files with fetchmany, so memory
+    use stays constant regardless of table size. A cancelled job removes its partial file.
+    """
+    def __init__(self, path: str, targets: List[ExportTarget], fmt: str, compress: bool, on_done: Callable[[Any], None], on_error: Callable[[Exception], None], on_progress: Optional[Callable[[ExportProgress], None]] = None, profile: Optional[ConnectionProfile] = None):
+        super().__init__(path, on_done, on_error, on_progress, profile); self.targets = targets; self.fmt = fmt; self.compress = compress
+    def work(self, conn: sqlite3.Connection) -> List[ExportProgress]:
+        return [self._export(conn, target) for target in self.targets if not self.cancelled]
+    def _open(self, output_path: str) -> IO[str]:
+        if self.compress: return gzip.open(output_path, 'wt', encoding='utf-8', newline='')
+        return open(output_path, 'w', encoding='utf-8', newline='')
+    def _export(self, conn: sqlite3.Connection, target: ExportTarget) -> ExportProgress:
+        total = conn.execute(f"SELECT COUNT(*) FROM ({target.query})", target.params).fetchone()[0]
+        created = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (target.table_name,)).fetchone()
+        cursor = conn.execute(target.query, target.params); col_names = [d[0] for d in cursor.description]
+        start = last_report = time.perf_counter(); rows_done = 0
+        try:
+            with self._open(target.output_path) as out:
+                writer = WRITERS[self.fmt](out, target.table_name, col_names, created[0] if created else None); writer.begin()
+                while not self.cancelled:
+                    rows = cursor.fetchmany(FETCH_CHUNK)
+                    if not rows: break
+                    writer.write_rows(rows); rows_done += len(rows); now = time.perf_counter()
+                    if now - last_report >= PROGRESS_INTERVAL: last_report = now; self.progress(ExportProgress(target.table_name, rows_done, total, rows_done / (now - start)))
+                writer.end()
+            if self.cancelled: raise sqlite3.OperationalError("interrupted")
+        except BaseException:
+            if os.path.exists(target.output_path): os.remove(target.output_path)
+            raise
+        elapsed = max(time.perf_counter() - start, 1e-9); profiler.record_phase(f"export {self.fmt}", elapsed, rows_done)
+        return ExportProgress(target.table_name, rows_done, total, rows_done / elapsed)
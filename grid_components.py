@@ -1,87 +1,532 @@
 import wx
 import wx.grid as gridlib
 import sqlite3
-from typing import Any, List, Tuple, Optional, Dict, Callable, Set
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Any, List, NamedTuple, Tuple, Optional, Dict, Callable
+
+from cell_store import INTEGER, CellPage, storage_kind
+from edit_journal import EditJournal, CELL, NEW_CELL, INSERT, DELETE, DELETE_NEW
+from instrumentation import profiler
+
+# --- Paging ---
+PAGE_SIZE = 256
+MAX_CACHED_PAGES = 64
+READAHEAD_PAGES = 1
+# --- Column width sampling ---
+SAMPLE_WINDOW = 2000      # rows the random sample reads
+SAMPLE_LONGEST = 3        # longest values kept per column from that window
+
+def quote_identifier(name: str) -> str: return '"' + name.replace('"', '""') + '"'
+
+TYPE_CONVERTERS: Dict[str, Callable[[str], Any]] = {'int': int, 'integer': int, 'real': float, 'float': float, 'double': float}
+
+def column_parser(declared_type: str) -> Callable[[str], Any]:
+    """Returns the converter for text typed into (or imported into) a column of the given declared type."""
+    lowered = declared_type.lower()
+    return next((TYPE_CONVERTERS[key] for key in TYPE_CONVERTERS if key in lowered), str)
+
+# Filter operators: SQL template for a column, and whether the operator takes a value.
+FILTER_OPERATORS: Dict[str, Tuple[str, bool]] = {
+    '=': ("{col} = ?", True), '!=': ("{col} != ?", True), '<': ("{col} < ?", True), '<=': ("{col} <= ?", True),
+    '>': ("{col} > ?", True), '>=': ("{col} >= ?", True), 'contains': ("{col} LIKE ? ESCAPE '\\'", True),
+    'starts with': ("{col} LIKE ? ESCAPE '\\'", True), 'is empty': ("{col} IS NULL", False), 'is not empty': ("{col} IS NOT NULL", False),
+}
+# Operators an index on the column can serve; LIKE is left out because it is case-insensitive by default.
+INDEXABLE_OPERATORS = {'=', '<', '<=', '>', '>=', 'is empty'}
+
+def like_pattern(text: str, prefix_only: bool = False) -> str:
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped + '%' if prefix_only else '%' + escaped + '%'
+
+def _format_text(value: Any) -> str: return str(value) if value is not None else ''
+def _format_bool(value: Any) -> str: return "1" if value else "0"
+
+class TableSnapshot(NamedTuple):
+    """Everything needed to open a table view, read in one pass so it can be done off the main thread."""
+    table_name: str
+    schema_info: List[tuple]
+    has_rowid: bool
+    row_count: int
+    first_rows: List[tuple]
+    samples: Optional[List[List[Any]]] = None  # longest values per column from a random window, for column sizing
+
+ROWID_ALIASES = ('rowid', '_rowid_', 'oid')
+
+def rowid_alias(schema_info: List[tuple]) -> Optional[str]:
+    """Returns a name that reaches the rowid: a column called rowid (or _rowid_, oid) hides the real one under that name."""
+    names = {col[1].lower() for col in schema_info}
+    return next((alias for alias in ROWID_ALIASES if alias not in names), None)
+
+def key_columns(schema_info: List[tuple], has_rowid: bool) -> List[str]:
+    """Returns the columns rows are paged by: the rowid, or the primary key of a WITHOUT ROWID table."""
+    if has_rowid: return [rowid_alias(schema_info)]
+    return [col[1] for col in sorted((c for c in schema_info if c[5]), key=lambda c: c[5])]
+
+def sample_longest(conn: sqlite3.Connection, table_name: str, col_names: List[str], key_col: str, window: int = SAMPLE_WINDOW, limit: int = SAMPLE_LONGEST) -> List[List[Any]]:
+    """
+    Returns, for every column, its longest values (by SQL length()) among one window of rows, in a
+    single statement. The window starts at a random point between the smallest and largest value
+    of the leading key column, found by index seeks, so the cost is bounded by window however large
+    the table is; tables keyed by text are sampled from their first rows instead.
+    """
+    table, key = quote_identifier(table_name), quote_identifier(key_col)
+    values = ", ".join(f"{quote_identifier(name)} AS c{i}" for i, name in enumerate(col_names))
+    start = ("SELECT CASE WHEN typeof(lo) IN ('integer', 'real') AND typeof(hi) IN ('integer', 'real') "
+             "THEN lo + max(hi - lo - ?, 0) * (abs(random() % 1000000) / 1000000.0) ELSE lo END FROM bounds")
+    # The window is read once (SQLite materializes a CTE used more than once) and ranked per column.
+    longest = " UNION ALL ".join(f"SELECT * FROM (SELECT {i}, c{i} FROM sampled WHERE c{i} IS NOT NULL ORDER BY length(c{i}) DESC LIMIT ?)" for i in range(len(col_names)))
+    rows = conn.execute(
+        f"WITH bounds AS (SELECT (SELECT min({key}) FROM {table}) AS lo, (SELECT max({key}) FROM {table}) AS hi), "
+        f"sampled AS (SELECT {values} FROM {table} WHERE {key} >= ({start}) ORDER BY {key} LIMIT ?) {longest}",
+        (window, window) + (limit,) * len(col_names)).fetchall()
+    samples: List[List[Any]] = [[] for _ in col_names]
+    for col, value in rows: samples[col].append(value)
+    return samples
+
+def read_table_snapshot(conn: sqlite3.Connection, table_name: str, first_rows: int = PAGE_SIZE * (1 + READAHEAD_PAGES), progress: Optional[Callable[[str], None]] = None, sample: bool = False) -> TableSnapshot:
+    table = quote_identifier(table_name); report = progress or (lambda message: None)
+    report(f"Reading schema of {table_name}...")
+    schema_info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not schema_info: raise sqlite3.OperationalError(f"no such table: {table_name}")
+    alias = rowid_alias(schema_info); has_rowid = alias is not None
+    try:
+        # Unquoted on purpose: SQLite reads a quoted name it can't resolve as a string literal, which would always succeed.
+        if has_rowid: conn.execute(f"SELECT {alias} FROM {table} LIMIT 0")
+    except sqlite3.OperationalError: has_rowid = False
+    if not key_columns(schema_info, has_rowid): raise sqlite3.OperationalError(f"{table_name} has neither a reachable rowid nor a primary key to page by")
+    report(f"Counting rows in {table_name}...")
+    row_count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    report(f"Reading first rows of {table_name}...")
+    keys = ", ".join(quote_identifier(c) for c in key_columns(schema_info, has_rowid))
+    rows = conn.execute(f"SELECT {keys}, * FROM {table} ORDER BY {keys} LIMIT ?", (first_rows,)).fetchall()
+    samples = None
+    if sample:
+        report(f"Sampling values in {table_name}...")
+        try: samples = sample_longest(conn, table_name, [col[1] for col in schema_info], key_columns(schema_info, has_rowid)[0])
+        except sqlite3.Error: pass  # sizing falls back to the first page
+    return TableSnapshot(table_name, schema_info, has_rowid, row_count, rows, samples)
+
+class FloatCellEditor(gridlib.GridCellTextEditor):
+    """A plain text editor for REAL columns that rejects text which isn't a number, so the stored value's full precision is edited as is."""
+    def EndEdit(self, row: int, col: int, grid: gridlib.Grid, oldval: str) -> Optional[str]:
+        value = super().EndEdit(row, col, grid, oldval)
+        if not value: return value
+        try: float(value)
+        except ValueError: wx.Bell(); return None
+        return value
+
+class ColumnPlan(NamedTuple):
+    """How one column is shown and parsed, resolved once per table so per-cell calls only index into it."""
+    col_type: str
+    formatter: Callable[[Any], str]
+    parser: Callable[[str], Any]
+    attr: Optional[gridlib.GridCellAttr]
+    storage: str  # how the column is packed in cached pages (see cell_store)
 
 class SQLiteGridTable(gridlib.GridTableBase):
     """
     A custom GridTableBase to interface a wx.grid.Grid with an SQLite table.
-    This class manages fetching, creating, updating, and deleting rows.
+    Rows are never loaded all at once: the row count comes from a COUNT(*) query and
+    rows are fetched in fixed-size pages using keyset pagination on the rowid (or the
+    primary key of WITHOUT ROWID tables). Pages live in a bounded LRU cache and are
+    stored column-wise as CellPages, so numeric cells cost 8 bytes rather than a boxed object.
+    An optional sort column and filter conditions are pushed into the paged query as
+    ORDER BY and WHERE clauses; pages then follow (sort value, key) cursors.
+    A TableSnapshot read elsewhere (e.g. on a loader thread) can seed the schema,
+    row count and first pages so construction runs no queries.
+    Pending edits, inserts and deletes are recorded in an EditJournal and overlaid on
+    top of the cached pages.
     """
-    def __init__(self, db_conn: sqlite3.Connection, table_name: str):
+    def __init__(self, db_conn: sqlite3.Connection, table_name: str, page_size: int = PAGE_SIZE, max_cached_pages: int = MAX_CACHED_PAGES, snapshot: Optional[TableSnapshot] = None):
         super().__init__()
-        self.db_conn = db_conn; self.table_name = table_name; self.column_info: List[Tuple[str, str]] = []; self.col_names: List[str] = []; self.data: List[List[Any]] = []; self.original_data: List[List[Any]] = []; self.rows_to_delete: Set[Any] = set(); self.primary_key_col: Optional[str] = None; self.primary_key_index: int = -1
-        self._type_converters: Dict[str, Callable[[Any], Any]] = {'int': int, 'integer': int, 'real': float, 'float': float, 'double': float}
-        self._load_schema(); self.refresh_data()
+        self.db_conn = db_conn; self.table_name = table_name; self.column_info: List[Tuple[str, str]] = []; self.col_names: List[str] = []; self.journal = EditJournal(); self.primary_key_col: Optional[str] = None; self.primary_key_index: int = -1
+        self.key_cols: List[str] = []; self.row_count: int = 0; self.page_size = page_size; self.max_cached_pages = max_cached_pages
+        self._pages: "OrderedDict[int, CellPage]" = OrderedDict(); self._page_bounds: Dict[int, tuple] = {}; self._last_page: int = 0; self._view_rows: int = 0
+        self._deleted_offsets: List[int] = []; self._new_row_positions: List[int] = []; self._key_col_indexes: List[int] = []
+        self.sort: Optional[Tuple[int, bool]] = None; self.filters: List[Tuple[int, str, Any]] = []; self._indexes: Optional[Dict[str, List[str]]] = None
+        self.column_plan: List[ColumnPlan] = []; self._formatters: List[Callable[[Any], str]] = []; self._parsers: List[Callable[[str], Any]] = []
+        self._storage_kinds: List[str] = []; self._key_kinds: List[str] = []
+        self.generation: int = 0  # bumped whenever any shown value or row may have changed
+        self.page_loaded: Optional[Callable[[CellPage], None]] = None  # called with each page fetched from the database
+        self.read_failed: Optional[Callable[[sqlite3.Error], None]] = None  # called once when paging starts failing (locks, I/O errors)
+        self._read_error = False
+        snapshot = snapshot or read_table_snapshot(db_conn, table_name, page_size * (1 + READAHEAD_PAGES))
+        self.samples: Optional[List[List[Any]]] = snapshot.samples; self._load_schema(snapshot.schema_info, snapshot.has_rowid); self._reset(snapshot.row_count, snapshot.first_rows)
     def _execute_query(self, query: str, params: tuple = ()) -> List[Any]:
-        cursor = self.db_conn.cursor(); cursor.execute(query, params); return cursor.fetchall()
-    def _load_schema(self):
-        schema_info = self._execute_query(f"PRAGMA table_info('{self.table_name}')")
+        start = time.perf_counter(); cursor = self.db_conn.cursor(); cursor.execute(query, params); rows = cursor.fetchall()
+        profiler.record_query(self.db_conn, query, params, time.perf_counter() - start, len(rows)); return rows
+    def _load_schema(self, schema_info: List[tuple], has_rowid: bool):
         self.column_info = [(col[1], col[2]) for col in schema_info]; self.col_names = [info[0] for info in self.column_info]
         for i, col in enumerate(schema_info):
             if col[5] == 1: self.primary_key_col = self.col_names[i]; self.primary_key_index = i; break
+        pk_cols = key_columns(schema_info, has_rowid=False); self.key_cols = key_columns(schema_info, has_rowid)
+        # Columns whose values decide a row's key, and therefore its position in key order.
+        if not has_rowid: self._key_col_indexes = [self.col_names.index(c) for c in pk_cols]
+        elif len(pk_cols) == 1 and self.column_info[self.primary_key_index][1].upper() == 'INTEGER': self._key_col_indexes = [self.primary_key_index]
+        else: self._key_col_indexes = []
+        self.column_plan = [self._plan_column(name, col_type) for name, col_type in self.column_info]
+        self._formatters = [plan.formatter for plan in self.column_plan]; self._parsers = [plan.parser for plan in self.column_plan]
+        self._storage_kinds = [plan.storage for plan in self.column_plan]
+        self._key_kinds = [INTEGER] if has_rowid else [self._storage_kinds[self.col_names.index(c)] for c in self.key_cols]
+    def _plan_column(self, name: str, declared_type: str) -> ColumnPlan:
+        col_type = declared_type.upper(); name = name.lower(); parser = column_parser(declared_type); storage = storage_kind(declared_type)
+        is_bool = 'BOOL' in col_type or ('INT' in col_type and (name.startswith('is_') or name.startswith('has_')))
+        if is_bool: editor, renderer = gridlib.GridCellBoolEditor(), gridlib.GridCellBoolRenderer()
+        elif 'INT' in col_type: editor, renderer = gridlib.GridCellNumberEditor(), gridlib.GridCellNumberRenderer()
+        # REAL cells keep the default string renderer: a fixed-precision one would show (and re-save) rounded values.
+        elif 'REAL' in col_type or 'FLOAT' in col_type or 'DOUBLE' in col_type: editor, renderer = FloatCellEditor(), gridlib.GridCellStringRenderer()
+        else: return ColumnPlan(col_type, _format_text, parser, None, storage)
+        attr = gridlib.GridCellAttr(); attr.SetEditor(editor); attr.SetRenderer(renderer)
+        return ColumnPlan(col_type, _format_bool if is_bool else _format_text, parser, attr, storage)
     def refresh_data(self):
-        rows = self._execute_query(f"SELECT * FROM {self.table_name}"); self.data = [list(row) for row in rows]; self.original_data = [list(row) for row in self.data]; self.rows_to_delete.clear()
-        if self.GetView(): self.GetView().ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_REQUEST_VIEW_GET_VALUES))
+        where, params = self._where()
+        with profiler.phase("refresh"): self._reset(self._execute_query(f"SELECT COUNT(*) FROM {quote_identifier(self.table_name)}{where}", params)[0][0])
+    def set_view(self, sort: Optional[Tuple[int, bool]], filters: List[Tuple[int, str, Any]]):
+        """
+        Re-queries the table ordered by sort=(column, descending) and limited to rows matching every
+        (column, operator, value) filter. Pending changes are discarded, so save them first.
+        """
+        self.sort = sort; self.filters = list(filters); self.refresh_data()
+    def _filter_value(self, col: int, op: str, value: Any) -> Any:
+        if not FILTER_OPERATORS[op][1]: return None
+        if op in ('contains', 'starts with'): return like_pattern(str(value), prefix_only=op == 'starts with')
+        if isinstance(value, str):
+            try: return self._parsers[col](value)
+            except ValueError: return value
+        return value
+    def _reset(self, row_count: int, first_rows: Optional[List[tuple]] = None):
+        self.row_count = row_count; self._pages.clear(); self._page_bounds.clear(); self._last_page = 0
+        self.journal.clear(); self._deleted_offsets.clear(); self._new_row_positions.clear()
+        if first_rows: self._store_rows(0, first_rows, -(-len(first_rows) // self.page_size))
+        self._sync_view()
+    def _sync_view(self):
+        """Tells the attached grid about row count changes and asks it to repaint."""
+        self.generation += 1
+        view, old_rows, new_rows = self.GetView(), self._view_rows, self.GetNumberRows(); self._view_rows = new_rows
+        if not view: return
+        if new_rows > old_rows: view.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_APPENDED, new_rows - old_rows))
+        elif new_rows < old_rows: view.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_NOTIFY_ROWS_DELETED, new_rows, old_rows - new_rows))
+        view.ProcessTableMessage(gridlib.GridTableMessage(self, gridlib.GRIDTABLE_REQUEST_VIEW_GET_VALUES))
+    # --- Paging ---
+    def _key_clause(self) -> str: return ", ".join(quote_identifier(c) for c in self.key_cols)
+    def _cursor_columns(self) -> List[str]:
+        return ([quote_identifier(self.col_names[self.sort[0]])] if self.sort else []) + [quote_identifier(c) for c in self.key_cols]
+    def _cursor_clause(self) -> str: return ", ".join(self._cursor_columns())
+    def _descending(self, reverse: bool = False) -> bool: return bool(self.sort and self.sort[1]) != reverse
+    def _order_clause(self, reverse: bool = False) -> str:
+        # The key follows the sort direction, so a descending view walks an index on the sort column backwards.
+        direction = 'DESC' if self._descending(reverse) else 'ASC'
+        return ", ".join(f"{c} {direction}" for c in self._cursor_columns())
+    def _row_cursor(self, key: tuple, values: List[Any]) -> tuple:
+        """A row's position in view order: its sort value (if sorted) followed by its key."""
+        return ((values[self.sort[0]],) if self.sort else ()) + key
+    def _after_segments(self, cursor: tuple, reverse: bool = False) -> List[Tuple[str, list]]:
+        """
+        SQL predicates matching the rows strictly after cursor in view order (before it if reverse),
+        split into segments that follow each other in that order. Each segment is a single row-value
+        range, so an index on the sort column (or the key itself) seeks straight to it; NULL sort
+        values, which SQLite orders first, get a segment of their own rather than an OR.
+        """
+        descending = self._descending(reverse); op = '<' if descending else '>'; key = list(cursor[-len(self.key_cols):])
+        key_after = f"({self._key_clause()}) {op} ({', '.join('?' * len(self.key_cols))})"
+        if not self.sort: return [(key_after, key)]
+        col, value = quote_identifier(self.col_names[self.sort[0]]), cursor[0]
+        if value is None: return [(f"{col} IS NULL AND {key_after}", key)] + ([] if descending else [(f"{col} IS NOT NULL", [])])
+        after = (f"({self._cursor_clause()}) {op} ({', '.join('?' * len(cursor))})", [value] + key)
+        return [after] + ([(f"{col} IS NULL", [])] if descending else [])
+    def _where(self, extra: Optional[List[Tuple[str, list]]] = None) -> Tuple[str, tuple]:
+        clauses, params = [], []
+        for col, op, value in self.filters:
+            clauses.append(FILTER_OPERATORS[op][0].format(col=quote_identifier(self.col_names[col])))
+            if FILTER_OPERATORS[op][1]: params.append(self._filter_value(col, op, value))
+        for sql, extra_params in extra or []: clauses.append(sql); params.extend(extra_params)
+        return (" WHERE " + " AND ".join(f"({c})" for c in clauses) if clauses else ""), tuple(params)
+    def _rows_query(self, segment: Optional[Tuple[str, list]], limit: int) -> Tuple[str, tuple]:
+        where, params = self._where([segment] if segment else [])
+        return f"SELECT {self._key_clause()}, * FROM {quote_identifier(self.table_name)}{where} ORDER BY {self._order_clause()} LIMIT ?", params + (limit,)
+    def _fetch_rows(self, after: Optional[tuple], limit: int) -> List[Any]:
+        rows: List[Any] = []
+        for segment in self._after_segments(after) if after is not None else [None]:
+            rows += self._execute_query(*self._rows_query(segment, limit - len(rows)))
+            if len(rows) >= limit: break
+        return rows
+    def _page_start_key(self, page: int) -> Optional[tuple]:
+        """Returns the cursor the given page starts after, seeking with OFFSET on the cursor columns alone if it is not known yet."""
+        if page == 0: return None
+        if page - 1 not in self._page_bounds:
+            where, params = self._where()
+            found = self._execute_query(f"SELECT {self._cursor_clause()} FROM {quote_identifier(self.table_name)}{where} ORDER BY {self._order_clause()} LIMIT 1 OFFSET ?", params + (page * self.page_size - 1,))
+            if not found: return None
+            self._page_bounds[page - 1] = tuple(found[0])
+        return self._page_bounds[page - 1]
+    def _load_pages(self, page: int, count: int = 1):
+        start_key = self._page_start_key(page)
+        if page > 0 and start_key is None: self._store_page(page, CellPage([], self._key_kinds, self._storage_kinds)); return
+        rows = self._fetch_rows(start_key, self.page_size * count); start = time.perf_counter(); self._read_error = False
+        self._store_rows(page, rows, count); profiler.record_phase("pack pages", time.perf_counter() - start, len(rows))
+    def _store_rows(self, page: int, rows: List[Any], count: int):
+        """Splits key-prefixed result rows into consecutive cached pages."""
+        for i in range(count):
+            chunk = rows[i * self.page_size:(i + 1) * self.page_size]
+            if not chunk and i: break
+            self._store_page(page + i, CellPage(chunk, self._key_kinds, self._storage_kinds))
+    def _store_page(self, page: int, cells: CellPage):
+        self._pages[page] = cells; self._pages.move_to_end(page)
+        if cells.length:
+            self._page_bounds[page] = self._row_cursor(cells.key(cells.length - 1), cells.row(cells.length - 1))
+            if self.page_loaded: self.page_loaded(cells)
+        while len(self._pages) > self.max_cached_pages: self._pages.popitem(last=False)
+    def _get_page(self, page: int) -> CellPage:
+        if page == self._last_page and page in self._pages: return self._pages[page]
+        if page in self._pages: self._pages.move_to_end(page)
+        else:
+            # Read ahead in the direction the cursor is moving: forward pages share one keyset query.
+            if page >= self._last_page: self._load_pages(page, 1 + READAHEAD_PAGES)
+            else:
+                self._load_pages(page)
+                if page > 0 and page - 1 not in self._pages: self._load_pages(page - 1); self._pages.move_to_end(page)
+        self._last_page = page; return self._pages[page]
+    def cache_bytes(self) -> int:
+        """Approximate memory held by the cached pages."""
+        return sum(cells.nbytes() for cells in self._pages.values())
+    def _db_row(self, offset: int) -> Tuple[Optional[tuple], Optional[List[Any]]]:
+        """Returns the key and the stored (unedited) values of the row at a DB offset."""
+        cells = self._get_page(offset // self.page_size); i = offset % self.page_size
+        if i >= cells.length: return None, None
+        return cells.key(i), cells.row(i)
+    # --- Row mapping (pending inserts and deletes are overlaid on DB offsets) ---
+    def _resolve_row(self, row: int) -> Tuple[bool, int]:
+        """Maps a grid row to (is_new_row, index into new rows or DB offset)."""
+        i = bisect_left(self._new_row_positions, row)
+        if i < len(self._new_row_positions) and self._new_row_positions[i] == row: return True, i
+        visible = row - i; offset = visible
+        while True:
+            candidate = visible + bisect_right(self._deleted_offsets, offset)
+            if candidate == offset: return False, offset
+            offset = candidate
+    def _grid_row(self, offset: int) -> int:
+        """Maps a visible DB offset back to its current grid row."""
+        visible = offset - bisect_left(self._deleted_offsets, offset); row = visible
+        while True:
+            candidate = visible + bisect_right(self._new_row_positions, row)
+            if candidate == row: return row
+            row = candidate
+    def _row_values(self, row: int) -> Optional[List[Any]]:
+        if not 0 <= row < self.GetNumberRows(): return None
+        is_new, index = self._resolve_row(row)
+        if is_new: return self.journal.inserted[index]
+        key, values = self._db_row(index)
+        return values if key is None else self.journal.apply_edits(key, values)
+    def _cell_value(self, row: int, col: int) -> Any:
+        if not 0 <= row < self.GetNumberRows(): raise IndexError(row)
+        if self._new_row_positions or self._deleted_offsets:
+            is_new, offset = self._resolve_row(row)
+            if is_new: return self.journal.inserted[offset][col]
+        else: offset = row
+        cells = self._get_page(offset // self.page_size); i = offset % self.page_size
+        if i >= cells.length: raise IndexError(row)
+        edits = self.journal.edits.get(cells.key(i)) if self.journal.edits else None
+        return edits[col] if edits and col in edits else cells.columns[col].value(i)
+    def view_query(self) -> Tuple[str, tuple]:
+        """Returns the SELECT (and its parameters) for the saved rows this view shows, in view order."""
+        where, params = self._where()
+        return f"SELECT * FROM {quote_identifier(self.table_name)}{where} ORDER BY {self._order_clause()}", params
+    # --- Search and indexes ---
+    def find(self, text: str, col: Optional[int], from_row: int, forward: bool = True) -> Optional[int]:
+        """
+        Finds the next (or previous) row in view order after from_row whose column (or any column)
+        contains text, wrapping around at the end. Returns its grid row, or None if nothing matches.
+        """
+        cols = [col] if col is not None else range(len(self.col_names)); pattern = like_pattern(text)
+        match = (" OR ".join(f"{quote_identifier(self.col_names[c])} LIKE ? ESCAPE '\\'" for c in cols), [pattern] * len(cols))
+        start = None
+        if 0 <= from_row < self.GetNumberRows():
+            is_new, offset = self._resolve_row(from_row)
+            if not is_new:
+                key, values = self._db_row(offset)
+                if key is not None: start = self._row_cursor(key, values)
+        table, cursor_cols = quote_identifier(self.table_name), self._cursor_clause()
+        # Searching backwards walks the view in reverse, so "after" the cursor means before it on screen.
+        segments = (self._after_segments(start, reverse=not forward) if start is not None else []) + [None]
+        for segment in segments:
+            where, params = self._where([match] + ([segment] if segment else []))
+            found = self._execute_query(f"SELECT {cursor_cols} FROM {table}{where} ORDER BY {self._order_clause(reverse=not forward)} LIMIT 1", params)
+            if found: return self._grid_row(self._view_offset(tuple(found[0])))
+        return None
+    def _view_offset(self, cursor: tuple) -> int:
+        after = 0
+        for segment in self._after_segments(cursor):
+            where, params = self._where([segment])
+            after += self._execute_query(f"SELECT COUNT(*) FROM {quote_identifier(self.table_name)}{where}", params)[0][0]
+        return self.row_count - after - 1
+    def load_indexes(self) -> Dict[str, List[str]]:
+        """Reads PRAGMA index_list/index_info into a map of lower-cased leading column -> index names."""
+        self._indexes = {}; table = quote_identifier(self.table_name)
+        for _, name, _, _, partial in self._execute_query(f"PRAGMA index_list({table})"):
+            if partial: continue
+            info = sorted(self._execute_query(f"PRAGMA index_info({quote_identifier(name)})"))
+            if info and info[0][2]: self._indexes.setdefault(info[0][2].lower(), []).append(name)
+        return self._indexes
+    def is_index_backed(self, col: int) -> bool:
+        """True if SQLite can order or seek on this column without a full scan."""
+        if self._indexes is None: self.load_indexes()
+        if self._key_col_indexes and col == self._key_col_indexes[0]: return True
+        return self.col_names[col].lower() in self._indexes
+    def filter_is_index_backed(self) -> bool: return any(op in INDEXABLE_OPERATORS and self.is_index_backed(col) for col, op, _ in self.filters)
+    def create_index(self, col: int) -> str:
+        name = f"idx_{self.table_name}_{self.col_names[col]}"
+        self.db_conn.execute(f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)} ON {quote_identifier(self.table_name)} ({quote_identifier(self.col_names[col])})")
+        self.db_conn.commit(); self.load_indexes(); return name
     def get_column_type(self, col: int) -> str:
-        if 0 <= col < len(self.column_info): return self.column_info[col][1].upper()
+        if 0 <= col < len(self.column_plan): return self.column_plan[col].col_type
         return ""
-    def insert_row(self, at_row: int): self.data.insert(at_row, [None] * self.GetNumberCols())
+    def _insert_new_row(self, row_values: List[Any], at_row: int):
+        i = bisect_left(self._new_row_positions, at_row)
+        for j in range(i, len(self._new_row_positions)): self._new_row_positions[j] += 1
+        self._new_row_positions.insert(i, at_row); self.journal.inserted.insert(i, row_values)
+    def _remove_grid_row(self, at_row: int):
+        i = bisect_right(self._new_row_positions, at_row)
+        for j in range(i, len(self._new_row_positions)): self._new_row_positions[j] -= 1
+    def _new_row_index(self, row_values: List[Any]) -> int: return next(i for i, r in enumerate(self.journal.inserted) if r is row_values)
+    def insert_row(self, at_row: int):
+        row_values: List[Any] = [None] * self.GetNumberCols()
+        self._insert_new_row(row_values, at_row); self.journal.record((INSERT, row_values, at_row)); self._view_rows += 1; self.generation += 1
     def process_row_deletion(self, at_row: int) -> bool:
-        is_new_row = at_row >= len(self.original_data)
-        if not is_new_row:
-            if not self.has_primary_key(): return False
-            pk_val = self.original_data[at_row][self.primary_key_index]; self.rows_to_delete.add(pk_val); self.original_data.pop(at_row)
-        self.data.pop(at_row); return True
-    def is_dirty(self) -> bool: return bool(self.rows_to_delete) or len(self.data) != len(self.original_data) or self.data != self.original_data
-    def GetNumberRows(self) -> int: return len(self.data)
+        if not 0 <= at_row < self.GetNumberRows(): return False
+        is_new, index = self._resolve_row(at_row)
+        if is_new: row_values = self.journal.inserted.pop(index); self._new_row_positions.pop(index); self.journal.record((DELETE_NEW, row_values, at_row))
+        else:
+            key, _ = self._db_row(index)
+            if key is None: return False
+            self.journal.deleted[key] = index; insort(self._deleted_offsets, index); self.journal.record((DELETE, key, index, at_row))
+        self._remove_grid_row(at_row); self._view_rows -= 1; self.generation += 1; return True
+    def is_dirty(self) -> bool: return self.journal.is_dirty()
+    def undo(self) -> Optional[int]:
+        """Reverts the most recent journal entry and returns the grid row it affected."""
+        entry = self.journal.pop_undo()
+        return None if entry is None else self._replay(entry, reverse=True)
+    def redo(self) -> Optional[int]:
+        entry = self.journal.pop_redo()
+        return None if entry is None else self._replay(entry, reverse=False)
+    def _replay(self, entry: tuple, reverse: bool) -> int:
+        kind = entry[0]
+        if kind == CELL:
+            _, key, offset, col, old, new = entry; self.journal.set_cell(key, col, self._db_row(offset)[1][col], old if reverse else new); row = self._grid_row(offset)
+        elif kind == NEW_CELL:
+            _, row_values, col, old, new = entry; row_values[col] = old if reverse else new
+            row = self._new_row_positions[self._new_row_index(row_values)]
+        elif kind in (INSERT, DELETE_NEW) and (kind == INSERT) != reverse:
+            _, row_values, row = entry; self._insert_new_row(row_values, row)
+        elif kind in (INSERT, DELETE_NEW):
+            _, row_values, row = entry; index = self._new_row_index(row_values)
+            self.journal.inserted.pop(index); self._new_row_positions.pop(index); self._remove_grid_row(row)
+        elif reverse:
+            _, key, offset, row = entry; del self.journal.deleted[key]; self._deleted_offsets.remove(offset)
+            for j in range(bisect_left(self._new_row_positions, row), len(self._new_row_positions)): self._new_row_positions[j] += 1
+        else:
+            _, key, offset, row = entry; self.journal.deleted[key] = offset; insort(self._deleted_offsets, offset); self._remove_grid_row(row)
+        self._sync_view(); return min(row, self.GetNumberRows() - 1)
+    def GetNumberRows(self) -> int: return self.row_count - len(self._deleted_offsets) + len(self.journal.inserted)
     def GetNumberCols(self) -> int: return len(self.col_names)
     def GetColLabelValue(self, col: int) -> str: return self.col_names[col]
     def has_primary_key(self) -> bool: return self.primary_key_col is not None
     def GetValue(self, row: int, col: int) -> str:
-        try:
-            value = self.data[row][col]; col_type = self.get_column_type(col); col_name = self.GetColLabelValue(col).lower()
-            if 'BOOL' in col_type or ('INT' in col_type and (col_name.startswith('is_') or col_name.startswith('has_'))): return "1" if value else "0"
-            return str(value) if value is not None else ''
+        try: return self._formatters[col](self._cell_value(row, col))
         except IndexError: return ''
+        except sqlite3.Error as e:
+            # Cache misses query the database while the grid paints; a failure must not escape the wx callback.
+            if not self._read_error:
+                self._read_error = True
+                if self.read_failed: self.read_failed(e)
+            return ''
+    def GetAttr(self, row: int, col: int, kind: int) -> Optional[gridlib.GridCellAttr]:
+        attr = self.column_plan[col].attr if 0 <= col < len(self.column_plan) else None
+        if attr: attr.IncRef()
+        return attr
     def SetValue(self, row: int, col: int, value: str):
         try:
-            col_type = self.column_info[col][1].lower()
-            if value == '': self.data[row][col] = None; return
-            converter = next((self._type_converters[key] for key in self._type_converters if key in col_type), str)
-            self.data[row][col] = converter(value)
+            converted = None if value == '' else self._parsers[col](value)
+            old = self._cell_value(row, col)
+            if old == converted and type(old) is type(converted): return
+            is_new, index = self._resolve_row(row); self.generation += 1
+            if is_new: self.journal.inserted[index][col] = converted; self.journal.record((NEW_CELL, self.journal.inserted[index], col, old, converted)); return
+            key, values = self._db_row(index)
+            self.journal.set_cell(key, col, values[col], converted); self.journal.record((CELL, key, index, col, old, converted))
         except (ValueError, IndexError): pass
     def apply_changes(self) -> Tuple[bool, str]:
+        """
+        Writes the journal in one transaction. Updates are grouped by their set of changed
+        columns and inserts by their set of filled columns, and each group goes through a
+        single executemany inside its own savepoint. Only the affected rows are reconciled afterwards.
+        """
         if not self.is_dirty(): return True, "No changes to save."
-        has_updates = any(self.data[i] != self.original_data[i] for i in range(len(self.original_data)))
-        if not self.has_primary_key() and (self.rows_to_delete or has_updates): return False, "Cannot update or delete rows without a primary key."
-        cursor = self.db_conn.cursor()
+        table = quote_identifier(self.table_name); key_where = " AND ".join(f"{quote_identifier(c)}=?" for c in self.key_cols)
+        batches: List[Tuple[str, List[tuple]]] = []
+        if self.journal.deleted: batches.append((f'DELETE FROM {table} WHERE {key_where}', list(self.journal.deleted)))
+        updates: Dict[Tuple[int, ...], List[tuple]] = {}
+        for key, cols in self.journal.pending_updates():
+            changed = tuple(sorted(cols)); updates.setdefault(changed, []).append(tuple(cols[c] for c in changed) + key)
+        for changed, params in updates.items():
+            set_clause = ", ".join(f'{quote_identifier(self.col_names[c])} = ?' for c in changed)
+            batches.append((f'UPDATE {table} SET {set_clause} WHERE {key_where}', params))
+        inserts: Dict[Tuple[int, ...], List[tuple]] = {}
+        for values in self.journal.inserted:
+            filled = tuple(c for c, v in enumerate(values) if v is not None); inserts.setdefault(filled, []).append(tuple(values[c] for c in filled))
+        for filled, params in inserts.items():
+            if not filled: batches.append((f'INSERT INTO {table} DEFAULT VALUES', params)); continue
+            insert_clause = ", ".join(quote_identifier(self.col_names[c]) for c in filled)
+            batches.append((f'INSERT INTO {table} ({insert_clause}) VALUES ({", ".join("?" * len(filled))})', params))
+        cursor = self.db_conn.cursor(); save_start = time.perf_counter()
         try:
-            if self.rows_to_delete:
-                delete_query = f'DELETE FROM "{self.table_name}" WHERE "{self.primary_key_col}"=?'
-                cursor.executemany(delete_query, [(pk,) for pk in self.rows_to_delete])
-            set_clause = ", ".join(f'"{c}" = ?' for c in self.col_names)
-            update_query = f'UPDATE "{self.table_name}" SET {set_clause} WHERE "{self.primary_key_col}"=?'
-            insert_clause = ", ".join(f'"{c}"' for c in self.col_names)
-            placeholders = ", ".join(['?'] * len(self.col_names))
-            insert_query = f'INSERT INTO "{self.table_name}" ({insert_clause}) VALUES ({placeholders})'
-            for i in range(len(self.original_data)):
-                if self.data[i] != self.original_data[i]:
-                    cursor.execute(update_query, tuple(self.data[i]) + (self.original_data[i][self.primary_key_index],))
-            for i in range(len(self.original_data), len(self.data)):
-                cursor.execute(insert_query, tuple(self.data[i]))
-            self.db_conn.commit(); self.refresh_data(); return True, "Changes saved successfully."
+            if not self.db_conn.in_transaction: cursor.execute("BEGIN")
+            for i, (query, params) in enumerate(batches):
+                cursor.execute(f"SAVEPOINT batch_{i}"); start = time.perf_counter()
+                try: cursor.executemany(query, params)
+                except sqlite3.Error: cursor.execute(f"ROLLBACK TO batch_{i}"); raise
+                cursor.execute(f"RELEASE batch_{i}"); profiler.record_query(None, query, None, time.perf_counter() - start, len(params))
+            first_changed = self._first_changed_offset(updates)
+            start = time.perf_counter(); self.db_conn.commit(); profiler.record_phase("commit", time.perf_counter() - start)
         except sqlite3.Error as e: self.db_conn.rollback(); return False, f"Database error: {e}"
+        self._reconcile(first_changed); profiler.record_phase("save", time.perf_counter() - save_start, sum(len(params) for _, params in batches))
+        return True, "Changes saved successfully."
+    def _first_changed_offset(self, updates: Dict[Tuple[int, ...], List[tuple]]) -> Optional[int]:
+        """Returns the lowest DB offset whose row changed position after this save, or None if none moved."""
+        view_cols = set(self._key_col_indexes) | {col for col, _, _ in self.filters} | ({self.sort[0]} if self.sort else set())
+        if any(c in view_cols for changed in updates for c in changed): return 0
+        if self.journal.inserted and (self.sort or self.filters): return 0
+        first = self._deleted_offsets[0] if self._deleted_offsets else None
+        if self.journal.inserted:
+            explicit_keys = [tuple(values[c] for c in self._key_col_indexes) for values in self.journal.inserted]
+            explicit_keys = [k for k in explicit_keys if self._key_col_indexes and None not in k]
+            if explicit_keys:
+                keys = self._key_clause(); placeholders = ", ".join("?" * len(self.key_cols))
+                offset = self._execute_query(f"SELECT COUNT(*) FROM {quote_identifier(self.table_name)} WHERE ({keys}) < ({placeholders})", min(explicit_keys))[0][0]
+            else: offset = self.row_count - len(self._deleted_offsets)  # generated rowids land after every existing row
+            first = offset if first is None else min(first, offset)
+        return first
+    def _reconcile(self, first_changed: Optional[int]):
+        """Folds saved edits into the cached pages and drops only pages whose rows moved."""
+        # Under a filter, saved rows may have entered or left the view: only a recount knows how many rows it has.
+        if first_changed == 0 and self.filters: self.refresh_data(); return
+        self.row_count += len(self.journal.inserted) - len(self.journal.deleted)
+        if first_changed is not None:
+            first_page = first_changed // self.page_size
+            for page in [p for p in self._pages if p >= first_page]: del self._pages[page]
+            for page in [p for p in self._page_bounds if p >= first_page]: del self._page_bounds[page]
+        if self.journal.edits:
+            for cells in self._pages.values():
+                for i in range(cells.length):
+                    edits = self.journal.edits.get(cells.key(i))
+                    if edits:
+                        for col, value in edits.items(): cells.set(i, col, value)
+        self.journal.clear(); self._deleted_offsets.clear(); self._new_row_positions.clear(); self._sync_view()
 
 class DataTypeAwareGrid(gridlib.Grid):
-    """A custom Grid that uses specific cell editors based on data type."""
+    """
+    A custom Grid that uses specific cell editors based on data type.
+    Editors and renderers are shared per column through SQLiteGridTable.GetAttr,
+    so the grid never allocates an editor per cell.
+    """
     def __init__(self, parent): super().__init__(parent)
-    def GetCellEditor(self, row: int, col: int) -> gridlib.GridCellEditor:
-        table = self.GetTable()
-        if not table: return super().GetCellEditor(row, col)
-        col_type = table.get_column_type(col); col_name = table.GetColLabelValue(col).lower()
-        if 'INT' in col_type or 'REAL' in col_type or 'FLOAT' in col_type or 'DOUBLE' in col_type:
-            if 'INT' in col_type and (col_name.startswith('is_') or col_name.startswith('has_')): return gridlib.GridCellBoolEditor()
-            return gridlib.GridCellNumberEditor()
-        if 'BOOL' in col_type: return gridlib.GridCellBoolEditor()
-        return super().GetCellEditor(row, col)
\ No newline at end of file
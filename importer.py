@@ -0,0 +1,178 @@
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import time
+from itertools import chain, islice
+from typing import IO, Any, Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from connection import ConnectionProfile, open_connection
+from instrumentation import profiler
+from grid_components import column_parser, quote_identifier
+from workers import DatabaseWorker
+
+IMPORT_CHUNK = 10000
+TYPE_SAMPLE_ROWS = 1000
+PROGRESS_INTERVAL = 0.5  # seconds between progress reports
+IMPORT_WILDCARD = "CSV, TSV or JSON Lines (*.csv;*.tsv;*.jsonl;*.ndjson;*.gz)|*.csv;*.tsv;*.jsonl;*.ndjson;*.gz|All files (*.*)|*.*"
+
+class ImportOptions(NamedTuple):
+    source_path: str
+    table_name: str
+    create_table: bool
+    fast_pragmas: bool = False
+    defer_indexes: bool = False
+
+class ImportProgress(NamedTuple):
+    table_name: str
+    rows: int
+    rejected: int
+    rows_per_sec: float
+    reject_path: Optional[str] = None
+
+def reject_path_for(source_path: str) -> str:
+    base = source_path[:-3] if source_path.lower().endswith('.gz') else source_path
+    return os.path.splitext(base)[0] + ".rejects.csv"
+
+class RecordSource:
+    """Streams records from a CSV, TSV or JSON Lines file (optionally gzipped) one at a time."""
+    def __init__(self, path: str):
+        name = path[:-3].lower() if path.lower().endswith('.gz') else path.lower()
+        self._file: IO[str] = gzip.open(path, 'rt', encoding='utf-8-sig', newline='') if name != path.lower() else open(path, 'r', encoding='utf-8-sig', newline='')
+        self.is_json = name.endswith(('.jsonl', '.ndjson'))
+        if self.is_json:
+            self._lines = (line for line in self._file if line.strip()); self._first_line = next(self._lines, None)
+            first = json.loads(self._first_line) if self._first_line else {}
+            if not isinstance(first, dict): raise ValueError("JSON Lines records must be objects")
+            self.columns: List[str] = list(first)
+        else:
+            self._reader = csv.reader(self._file, delimiter='\t' if name.endswith('.tsv') else ','); self.columns = next(self._reader, [])
+    def __enter__(self) -> "RecordSource": return self
+    def __exit__(self, *exc): self._file.close()
+    def __iter__(self) -> Iterator[Tuple[Any, Optional[list]]]:
+        """Yields (raw record, values); values is None when the record itself cannot be parsed."""
+        if not self.is_json:
+            width = len(self.columns)
+            for row in self._reader: yield row, row if len(row) == width else None
+            return
+        for line in chain([self._first_line] if self._first_line else [], self._lines):
+            try: record = json.loads(line); yield line, [record.get(c) for c in self.columns]
+            except (ValueError, AttributeError): yield line, None
+
+def infer_column_types(sample: List[list], width: int) -> List[str]:
+    """Picks INTEGER, REAL or TEXT for each column: the narrowest type every non-empty sampled value fits."""
+    types = []
+    for col in range(width):
+        values = [row[col] for row in sample if row[col] not in (None, '')]; inferred = 'INTEGER'
+        for value in values:
+            if isinstance(value, bool) or isinstance(value, int): continue
+            if isinstance(value, float): inferred = 'REAL'; continue
+            if not isinstance(value, str): inferred = 'TEXT'; break
+            try: int(value); continue
+            except ValueError: pass
+            try: float(value); inferred = 'REAL'
+            except ValueError: inferred = 'TEXT'; break
+        types.append(inferred if values else 'TEXT')
+    return types
+
+def _make_converter(parser: Callable[[str], Any]) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if value is None or value == '': return None
+        if isinstance(value, str): return parser(value)
+        return json.dumps(value) if isinstance(value, (dict, list)) else value
+    return convert
+
+def _unique_names(names: List[str]) -> List[str]:
+    seen, result = set(), []
+    for i, name in enumerate(names):
+        name = name.strip() or f"column_{i + 1}"; candidate, n = name, 2
+        while candidate.lower() in seen: candidate = f"{name}_{n}"; n += 1
+        seen.add(candidate.lower()); result.append(candidate)
+    return result
+
+class ImportJob(DatabaseWorker):
+    """
+    Streams a CSV/TSV/JSON Lines file into a new or existing table in one transaction,
+    executemany-ing fixed-size chunks. A chunk that fails is replayed row by row so only its
+    bad rows are rejected; rejected rows and rows that fail conversion go to a reject file.
+    """
+    def __init__(self, path: str, options: ImportOptions, on_done: Callable[[Any], None], on_error: Callable[[Exception], None], on_progress: Optional[Callable[[ImportProgress], None]] = None, profile: Optional[ConnectionProfile] = None):
+        super().__init__(path, on_done, on_error, on_progress, profile); self.options = options
+        self._rejects: Optional[IO[str]] = None; self._reject_writer: Any = None; self.rejected = 0
+    read_only = False
+    def connect(self) -> sqlite3.Connection: return open_connection(self.path, self.profile, read_only=False, isolation_level=None)
+    def work(self, conn: sqlite3.Connection) -> ImportProgress:
+        opts = self.options; saved_pragmas = {}
+        if opts.fast_pragmas:
+            for pragma, value in (('synchronous', 'OFF'), ('journal_mode', 'MEMORY')):
+                current = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+                # Leaving WAL needs every other connection closed, and WAL appends are already cheap.
+                if pragma == 'journal_mode' and str(current).lower() == 'wal': continue
+                saved_pragmas[pragma] = current; conn.execute(f"PRAGMA {pragma}={value}")
+        try:
+            with RecordSource(opts.source_path) as source: return self._import(conn, source)
+        finally:
+            if conn.in_transaction: conn.execute("ROLLBACK")
+            for pragma, value in saved_pragmas.items(): conn.execute(f"PRAGMA {pragma}={value}")
+            if self._rejects: self._rejects.close()
+    def _import(self, conn: sqlite3.Connection, source: RecordSource) -> ImportProgress:
+        opts = self.options; table = quote_identifier(opts.table_name); records = iter(source)
+        if not source.columns: raise ValueError("The file has no header row or records.")
+        conn.execute("BEGIN IMMEDIATE")
+        if opts.create_table:
+            sample = list(islice(records, TYPE_SAMPLE_ROWS)); records = chain(sample, records)
+            names = _unique_names(source.columns); types = infer_column_types([values for _, values in sample if values is not None], len(names))
+            conn.execute(f"CREATE TABLE {table} ({', '.join(f'{quote_identifier(n)} {t}' for n, t in zip(names, types))})")
+            positions = list(range(len(names))); converters = [_make_converter(column_parser(t)) for t in types]
+        else:
+            column_info = {row[1].lower(): (row[1], row[2]) for row in conn.execute(f"PRAGMA table_info({table})")}
+            if not column_info: raise ValueError(f"Table '{opts.table_name}' does not exist.")
+            positions = [i for i, name in enumerate(source.columns) if name.strip().lower() in column_info]
+            if not positions: raise ValueError(f"No columns in the file match table '{opts.table_name}'.")
+            names = [column_info[source.columns[i].strip().lower()][0] for i in positions]
+            converters = [_make_converter(column_parser(column_info[source.columns[i].strip().lower()][1])) for i in positions]
+        deferred = self._drop_secondary_indexes(conn) if opts.defer_indexes else []
+        query = f"INSERT INTO {table} ({', '.join(quote_identifier(n) for n in names)}) VALUES ({', '.join('?' * len(names))})"
+        start = last_report = time.perf_counter(); inserted = 0
+        while not self.cancelled:
+            chunk = list(islice(records, IMPORT_CHUNK))
+            if not chunk: break
+            params, raws = [], []
+            for raw, values in chunk:
+                if values is None: self._reject(source, raw, "Malformed record"); continue
+                try: params.append(tuple(convert(values[i]) for convert, i in zip(converters, positions))); raws.append(raw)
+                except (ValueError, TypeError) as e: self._reject(source, raw, f"Conversion failed: {e}")
+            inserted += self._insert_chunk(conn, source, query, params, raws); now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL: last_report = now; self.progress(ImportProgress(opts.table_name, inserted, self.rejected, inserted / (now - start)))
+        if self.cancelled: raise sqlite3.OperationalError("interrupted")
+        for sql in deferred: conn.execute(sql)
+        conn.execute("COMMIT")
+        elapsed = max(time.perf_counter() - start, 1e-9); profiler.record_phase("import", elapsed, inserted); reject_path = reject_path_for(opts.source_path) if self.rejected else None
+        return ImportProgress(opts.table_name, inserted, self.rejected, inserted / elapsed, reject_path)
+    def _insert_chunk(self, conn: sqlite3.Connection, source: RecordSource, query: str, params: List[tuple], raws: List[Any]) -> int:
+        conn.execute("SAVEPOINT import_chunk")
+        try: conn.executemany(query, params); conn.execute("RELEASE import_chunk"); return len(params)
+        except sqlite3.Error:
+            if self.cancelled: raise
+            conn.execute("ROLLBACK TO import_chunk")
+        inserted = 0
+        for row, raw in zip(params, raws):
+            try: conn.execute(query, row); inserted += 1
+            except sqlite3.Error as e:
+                if self.cancelled: raise
+                self._reject(source, raw, str(e))
+        conn.execute("RELEASE import_chunk"); return inserted
+    def _drop_secondary_indexes(self, conn: sqlite3.Connection) -> List[str]:
+        """Drops the table's non-unique, user-created indexes and returns the SQL to recreate them after the load."""
+        deferred = []
+        for _, name, unique, origin, *_ in conn.execute(f"PRAGMA index_list({quote_identifier(self.options.table_name)})").fetchall():
+            if unique or origin != 'c': continue
+            sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='index' AND name=?", (name,)).fetchone()
+            if sql and sql[0]: deferred.append(sql[0]); conn.execute(f"DROP INDEX {quote_identifier(name)}")
+        return deferred
+    def _reject(self, source: RecordSource, raw: Any, reason: str):
+        if not self._rejects:
+            self._rejects = open(reject_path_for(self.options.source_path), 'w', encoding='utf-8', newline='')
+            self._reject_writer = csv.writer(self._rejects); self._reject_writer.writerow(["record", "error"] if source.is_json else source.columns + ["error"])
+        self._reject_writer.writerow([raw.rstrip("\r\n"), reason] if source.is_json else list(raw) + [reason]); self.rejected += 1
@@ -0,0 +1,79 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+HISTORY_SIZE = 500           # most recent timings kept individually
+PLANNED_STATEMENTS = ('SELECT', 'WITH')
+
+class Timing(NamedTuple):
+    """One timed query or phase."""
+    kind: str          # 'query' or 'phase'
+    label: str         # the SQL text, or the phase name
+    seconds: float
+    rows: int
+    started: float     # wall-clock time, for the JSON dump
+
+class Aggregate:
+    """Totals for one distinct SQL text or phase name."""
+    __slots__ = ('kind', 'label', 'calls', 'seconds', 'max_seconds', 'rows', 'plan')
+    def __init__(self, kind: str, label: str):
+        self.kind = kind; self.label = label; self.calls = 0; self.seconds = 0.0; self.max_seconds = 0.0; self.rows = 0; self.plan: Optional[List[str]] = None
+    def add(self, seconds: float, rows: int):
+        self.calls += 1; self.seconds += seconds; self.rows += rows
+        if seconds > self.max_seconds: self.max_seconds = seconds
+    def as_dict(self) -> Dict[str, Any]:
+        return {'kind': self.kind, 'label': self.label, 'calls': self.calls, 'total_ms': self.seconds * 1000, 'avg_ms': self.seconds * 1000 / max(self.calls, 1),
+                'max_ms': self.max_seconds * 1000, 'rows': self.rows, 'plan': self.plan}
+
+def query_plan(conn: sqlite3.Connection, sql: str, params: Any = ()) -> List[str]:
+    """EXPLAIN QUERY PLAN as indented lines. The statement itself is not run."""
+    depth: Dict[int, int] = {}; lines = []
+    for node, parent, _, detail in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params or ()).fetchall():
+        depth[node] = depth.get(parent, -1) + 1; lines.append("  " * depth[node] + detail)
+    return lines
+
+class Profiler:
+    """
+    Records per-query timings, row counts and EXPLAIN QUERY PLAN output, plus named phases
+    (refresh, save, export). Statements are aggregated by their SQL text, which is stable
+    here because values are always bound as parameters; each distinct SELECT is explained
+    once, on the connection and thread that ran it. Safe to call from worker threads.
+    """
+    def __init__(self, history: int = HISTORY_SIZE):
+        self.enabled = True; self._lock = threading.Lock()
+        self._history: Deque[Timing] = deque(maxlen=history); self._aggregates: Dict[Tuple[str, str], Aggregate] = {}
+    def record_query(self, conn: Optional[sqlite3.Connection], sql: str, params: Any, seconds: float, rows: int):
+        if not self.enabled: return
+        aggregate = self._add('query', sql, seconds, rows)
+        if aggregate.plan is None and conn is not None and sql.lstrip()[:6].upper().startswith(PLANNED_STATEMENTS):
+            try: aggregate.plan = query_plan(conn, sql, params)
+            except sqlite3.Error as e: aggregate.plan = [f"(no plan: {e})"]
+    def record_phase(self, name: str, seconds: float, rows: int = 0):
+        if self.enabled: self._add('phase', name, seconds, rows)
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try: yield
+        finally: self.record_phase(name, time.perf_counter() - start)
+    def _add(self, kind: str, label: str, seconds: float, rows: int) -> Aggregate:
+        with self._lock:
+            self._history.append(Timing(kind, label, seconds, rows, time.time()))
+            aggregate = self._aggregates.get((kind, label))
+            if aggregate is None: aggregate = self._aggregates[(kind, label)] = Aggregate(kind, label)
+            aggregate.add(seconds, rows); return aggregate
+    def clear(self):
+        with self._lock: self._history.clear(); self._aggregates.clear()
+    def summary(self) -> List[Aggregate]:
+        """Aggregates, slowest in total first."""
+        with self._lock: return sorted(self._aggregates.values(), key=lambda a: a.seconds, reverse=True)
+    def recent(self) -> List[Timing]:
+        with self._lock: return list(self._history)
+    def dump(self, path: str):
+        report = {'created': time.time(), 'summary': [a.as_dict() for a in self.summary()], 'recent': [t._asdict() for t in self.recent()]}
+        with open(path, 'w', encoding='utf-8') as out: json.dump(report, out, indent=2)
+
+profiler = Profiler()
@@ -0,0 +1,48 @@
+import wx
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional
+
+from cytolk import tolk
+
+NAVIGATION_DELAY_MS = 80       # idle time after the last cursor move before its cell is announced
+ANNOUNCEMENT_CACHE_SIZE = 4096
+
+class SpeechDispatcher:
+    """
+    Funnels all screen reader output. speak() talks right away; speak_later() is for
+    announcements that arrive in bursts (holding an arrow key, paging): each call replaces
+    the pending one and restarts a short timer, so only the last is built and spoken. It
+    interrupts an earlier deferred announcement still being read, but is queued after
+    anything spoken with speak(), such as status messages.
+    """
+    def __init__(self, delay_ms: int = NAVIGATION_DELAY_MS):
+        self.delay_ms = delay_ms; self._pending: Optional[Callable[[], str]] = None; self._timer: Optional[wx.CallLater] = None
+        self._last_deferred = False  # whether the most recent speech came from speak_later()
+    def speak(self, text: str, interrupt: bool = False):
+        self.cancel(); self._last_deferred = False; tolk.speak(text, interrupt)
+    def speak_later(self, build: Callable[[], str]):
+        """Schedules build() to be spoken once announcements stop arriving for delay_ms."""
+        self._pending = build
+        if self._timer is None: self._timer = wx.CallLater(self.delay_ms, self._flush)
+        else: self._timer.Start(self.delay_ms)
+    def cancel(self):
+        self._pending = None
+        if self._timer is not None and self._timer.IsRunning(): self._timer.Stop()
+    def _flush(self):
+        build, self._pending = self._pending, None
+        text = build() if build else ""
+        if text: tolk.speak(text, self._last_deferred); self._last_deferred = True
+
+class AnnouncementCache:
+    """Formatted announcements keyed by cell, all dropped when the generation they were built for changes."""
+    def __init__(self, size: int = ANNOUNCEMENT_CACHE_SIZE):
+        self.size = size; self._entries: "OrderedDict[Hashable, str]" = OrderedDict(); self._generation: Hashable = None
+    def get(self, generation: Hashable, key: Hashable, build: Callable[[], str]) -> str:
+        if generation != self._generation: self._entries.clear(); self._generation = generation
+        text = self._entries.get(key)
+        if text is None:
+            text = self._entries[key] = build()
+            if len(self._entries) > self.size: self._entries.popitem(last=False)
+        else: self._entries.move_to_end(key)
+        return text
+    def clear(self): self._entries.clear(); self._generation = None
@@ -0,0 +1,83 @@
+import os
+import sqlite3
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from grid_components import SQLiteGridTable
+
+TABLE_CACHE_BUDGET = 96 * 1024 * 1024  # bytes of cached pages kept across all parked table views
+
+class CacheToken(NamedTuple):
+    """What a database looked like when something was cached, from the connection and from disk."""
+    conn: sqlite3.Connection
+    schema_version: int
+    data_version: int
+    total_changes: int
+    signature: tuple
+
+def _file_signature(path: str) -> tuple:
+    stats = []
+    for name in (path, path + "-wal"):
+        try: st = os.stat(name); stats.append((st.st_mtime_ns, st.st_size))
+        except OSError: stats.append(None)
+    return tuple(stats)
+
+def cache_token(conn: sqlite3.Connection, path: str) -> CacheToken:
+    schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]; data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+    return CacheToken(conn, schema_version, data_version, conn.total_changes, _file_signature(path))
+
+def _data_unchanged(token: CacheToken, current: CacheToken) -> bool:
+    # data_version only moves for other connections' commits and total_changes for this one's, so
+    # both are compared on the same connection; across a reopen only the files on disk can tell.
+    if token.conn is current.conn: return (token.data_version, token.total_changes) == (current.data_version, current.total_changes)
+    return token.signature == current.signature
+
+class CachedView(NamedTuple):
+    table: SQLiteGridTable
+    token: CacheToken
+    size: int
+
+class TableCache:
+    """
+    Keeps table lists and recently shown table views (with their cached pages, sort and filter)
+    so switching back to a table, or reopening a recent file, skips the schema, count and first
+    page queries. A view is parked when another one is shown and handed back only if the
+    database has not changed since; views are evicted least recently used first once their
+    pages exceed the memory budget. Views with unsaved changes are never parked.
+    """
+    def __init__(self, budget: int = TABLE_CACHE_BUDGET):
+        self.budget = budget; self._views: "OrderedDict[Tuple[str, str], CachedView]" = OrderedDict(); self._used = 0
+        self._tables: Dict[str, Tuple[int, List[str]]] = {}
+    def tables(self, path: str, conn: sqlite3.Connection) -> Optional[List[str]]:
+        """The table list read for this database, if its schema is unchanged."""
+        entry = self._tables.get(os.path.abspath(path))
+        try:
+            if entry is None or entry[0] != conn.execute("PRAGMA schema_version").fetchone()[0]: return None
+        except sqlite3.Error: return None
+        return list(entry[1])
+    def put_tables(self, path: str, conn: sqlite3.Connection, tables: List[str]):
+        try: self._tables[os.path.abspath(path)] = (conn.execute("PRAGMA schema_version").fetchone()[0], list(tables))
+        except sqlite3.Error: pass
+    def park(self, path: str, conn: sqlite3.Connection, table: SQLiteGridTable):
+        key = (os.path.abspath(path), table.table_name); self._drop(key)
+        if table.is_dirty(): return
+        try: view = CachedView(table, cache_token(conn, path), table.cache_bytes())
+        except sqlite3.Error: return
+        self._views[key] = view; self._used += view.size
+        while self._used > self.budget and self._views: self._drop(next(iter(self._views)))
+    def take(self, path: str, conn: sqlite3.Connection, table_name: str) -> Optional[SQLiteGridTable]:
+        """Removes and returns a parked view if the database is unchanged since it was parked, re-bound to conn."""
+        view = self._drop((os.path.abspath(path), table_name))
+        if view is None: return None
+        try: current = cache_token(conn, path)
+        except sqlite3.Error: return None
+        if view.token.schema_version != current.schema_version or not _data_unchanged(view.token, current): return None
+        view.table.db_conn = conn; return view.table
+    def recent_table(self, path: str) -> Optional[str]:
+        """The most recently parked table of a database."""
+        path = os.path.abspath(path)
+        return next((name for db, name in reversed(self._views) if db == path), None)
+    def _drop(self, key: Tuple[str, str]) -> Optional[CachedView]:
+        view = self._views.pop(key, None)
+        if view is not None: self._used -= view.size
+        return view
@@ -0,0 +1,166 @@
+"""
+Checks SQLiteGridTable's write path (edit journal, undo/redo, batched saves and page reconciliation)
+against an in-memory database: after every save the grid must show exactly what SQL returns.
+Pages are kept tiny so saves cross page boundaries and hit the cache. Runs without a wx.App.
+"""
+import os
+import sqlite3
+import sys
+from typing import Any, List
+
+import pytest
+
+pytest.importorskip("wx")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from grid_components import SQLiteGridTable
+
+ROWS = 30
+# name -> (CREATE TABLE, ORDER BY for key order)
+SCHEMAS = {
+    'rowid': ("CREATE TABLE items (name TEXT, qty INTEGER, price REAL)", "rowid"),
+    'integer_pk': ("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, qty INTEGER, price REAL)", "id"),
+    'without_rowid': ("CREATE TABLE items (region TEXT, seq INTEGER, name TEXT, qty INTEGER, price REAL, PRIMARY KEY (region, seq)) WITHOUT ROWID", "region, seq"),
+    # A user column named rowid hides the real rowid under that name.
+    'shadowed_rowid': ("CREATE TABLE items (rowid INTEGER, name TEXT, qty INTEGER, price REAL)", "_rowid_"),
+}
+KEYED = ('integer_pk', 'without_rowid')  # kinds whose key is shown as columns
+
+def _text(value: Any) -> str: return '' if value is None else str(value)
+
+def _seed(conn: sqlite3.Connection, kind: str):
+    conn.execute(SCHEMAS[kind][0])
+    for i in range(ROWS):
+        values = {'name': f"item {i}", 'qty': i % 7, 'price': i / 4}
+        if kind == 'integer_pk': values['id'] = i * 3 + 1
+        if kind == 'without_rowid': values.update(region="ab"[i % 2], seq=i)
+        if kind == 'shadowed_rowid': values['rowid'] = 1
+        conn.execute(f"INSERT INTO items ({', '.join(values)}) VALUES ({', '.join('?' * len(values))})", tuple(values.values()))
+    conn.commit()
+
+@pytest.fixture(params=list(SCHEMAS))
+def kind(request) -> str: return request.param
+
+@pytest.fixture
+def conn(kind: str):
+    conn = sqlite3.connect(":memory:"); _seed(conn, kind)
+    yield conn
+    conn.close()
+
+@pytest.fixture
+def table(conn: sqlite3.Connection) -> SQLiteGridTable: return SQLiteGridTable(conn, 'items', page_size=4, max_cached_pages=3)
+
+def col(table: SQLiteGridTable, name: str) -> int: return table.col_names.index(name)
+
+def shown(table: SQLiteGridTable) -> List[List[str]]:
+    return [[table.GetValue(row, c) for c in range(table.GetNumberCols())] for row in range(table.GetNumberRows())]
+
+def assert_matches_sql(table: SQLiteGridTable, conn: sqlite3.Connection, kind: str, where: str = "", order: str = ""):
+    # Ties under a sort are broken by the key in the same direction as the sort.
+    key_order = SCHEMAS[kind][1] if not order.endswith(" DESC") else ", ".join(f"{c} DESC" for c in SCHEMAS[kind][1].split(", "))
+    order_by = ", ".join(filter(None, [order, key_order]))
+    expected = [[_text(v) for v in row] for row in conn.execute(f"SELECT * FROM items {where} ORDER BY {order_by}")]
+    assert table.GetNumberRows() == len(expected)
+    assert shown(table) == expected
+
+def insert(table: SQLiteGridTable, kind: str, at_row: int, name: str, qty: int, seq: int):
+    table.insert_row(at_row); table.SetValue(at_row, col(table, 'name'), name); table.SetValue(at_row, col(table, 'qty'), str(qty))
+    if kind == 'without_rowid': table.SetValue(at_row, col(table, 'region'), "c"); table.SetValue(at_row, col(table, 'seq'), str(seq))
+
+def save(table: SQLiteGridTable):
+    ok, message = table.apply_changes()
+    assert ok, message
+    assert not table.is_dirty()
+
+def test_edit_delete_insert(table, conn, kind):
+    assert_matches_sql(table, conn, kind)
+    table.SetValue(5, col(table, 'name'), "renamed"); table.SetValue(17, col(table, 'price'), "0.1234567891")
+    assert table.process_row_deletion(9) and table.process_row_deletion(2)
+    insert(table, kind, 3, "new", 4, 100)
+    assert table.GetNumberRows() == ROWS - 1 and table.GetValue(3, col(table, 'name')) == "new"
+    save(table); assert_matches_sql(table, conn, kind)
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE price = 0.1234567891").fetchone()[0] == 1
+    table.SetValue(0, col(table, 'qty'), "42"); table.process_row_deletion(table.GetNumberRows() - 1)
+    save(table); assert_matches_sql(table, conn, kind)
+
+def test_undo_redo(table, conn, kind):
+    # One state per journal entry: inserting a row and filling its cells are separate undo steps.
+    states = [shown(table)]
+    table.SetValue(6, col(table, 'name'), "edited"); states.append(shown(table))
+    assert table.process_row_deletion(4); states.append(shown(table))
+    table.insert_row(10); states.append(shown(table))
+    table.SetValue(10, col(table, 'name'), "inserted"); states.append(shown(table))
+    if kind == 'without_rowid':
+        table.SetValue(10, col(table, 'region'), "c"); states.append(shown(table))
+        table.SetValue(10, col(table, 'seq'), "200"); states.append(shown(table))
+    table.SetValue(6, col(table, 'qty'), "9"); states.append(shown(table))
+    for state in reversed(states[:-1]):
+        assert table.undo() is not None and shown(table) == state
+    assert table.undo() is None and not table.is_dirty()
+    for state in states[1:]:
+        assert table.redo() is not None and shown(table) == state
+    assert table.redo() is None
+    save(table); assert_matches_sql(table, conn, kind)
+
+def test_edit_key_column(table, conn, kind):
+    if kind not in KEYED: pytest.skip("the rowid is not shown as a column")
+    key = col(table, 'id' if kind == 'integer_pk' else 'seq')
+    table.SetValue(1, key, "1000"); table.SetValue(20, key, "-5")
+    save(table); assert_matches_sql(table, conn, kind)
+
+def test_save_under_sort(table, conn, kind):
+    qty = col(table, 'qty'); table.set_view((qty, True), [])
+    assert_matches_sql(table, conn, kind, order="qty DESC")
+    table.SetValue(0, qty, "0"); table.SetValue(ROWS - 1, qty, "99"); table.SetValue(12, col(table, 'name'), "renamed")
+    insert(table, kind, 5, "new", 3, 300); assert table.process_row_deletion(20)
+    save(table); assert_matches_sql(table, conn, kind, order="qty DESC")
+    table.SetValue(8, col(table, 'price'), "2.5")
+    save(table); assert_matches_sql(table, conn, kind, order="qty DESC")
+
+def test_save_under_filter(table, conn, kind):
+    qty = col(table, 'qty'); table.set_view(None, [(qty, '>=', '3')])
+    assert_matches_sql(table, conn, kind, where="WHERE qty >= 3")
+    table.SetValue(2, qty, "1"); table.SetValue(5, col(table, 'name'), "renamed")
+    save(table); assert_matches_sql(table, conn, kind, where="WHERE qty >= 3")
+    insert(table, kind, 0, "kept", 5, 400); insert(table, kind, 1, "filtered out", 0, 401)
+    save(table); assert_matches_sql(table, conn, kind, where="WHERE qty >= 3")
+    assert table.process_row_deletion(3)
+    save(table); assert_matches_sql(table, conn, kind, where="WHERE qty >= 3")
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_sorted_paging_with_nulls(table, conn, kind, descending):
+    conn.execute("UPDATE items SET qty = NULL WHERE price < 2"); conn.commit()
+    qty = col(table, 'qty'); order = "qty DESC" if descending else "qty ASC"; table.set_view((qty, descending), [])
+    assert_matches_sql(table, conn, kind, order=order)
+    # Reading bottom up with a two-page cache makes every page seek from a cursor (or an OFFSET) rather than follow on.
+    expected = shown(table); table.max_cached_pages = 2; table.set_view((qty, descending), [])
+    assert [[table.GetValue(row, c) for c in range(table.GetNumberCols())] for row in reversed(range(ROWS))] == expected[::-1]
+    assert_matches_sql(table, conn, kind, order=order)
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_find_under_sort(table, conn, kind, descending):
+    conn.execute("UPDATE items SET qty = NULL WHERE price < 2"); conn.commit()
+    table.set_view((col(table, 'qty'), descending), []); names = [row[col(table, 'name')] for row in shown(table)]
+    for start in (0, 7, ROWS - 1):
+        after = [r for r in range(start + 1, ROWS) if names[r].startswith("item 2")] or [r for r in range(ROWS) if names[r].startswith("item 2")]
+        before = [r for r in range(start) if names[r].startswith("item 2")] or [r for r in range(ROWS) if names[r].startswith("item 2")]
+        assert table.find("item 2", col(table, 'name'), start) == after[0]
+        assert table.find("item 2", col(table, 'name'), start, forward=False) == before[-1]
+
+@pytest.mark.parametrize('descending', [False, True])
+def test_sorted_pages_seek_an_index(table, conn, kind, descending):
+    conn.execute("UPDATE items SET qty = NULL WHERE price < 2"); conn.execute("CREATE INDEX items_qty ON items (qty)"); conn.commit()
+    table.set_view((col(table, 'qty'), descending), [])
+    key = tuple(table.GetValue(0, col(table, c)) for c in SCHEMAS[kind][1].split(", ")) if kind in KEYED else (1,)
+    for value in (None, 3):
+        for segment in table._after_segments((value,) + key):
+            plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + table._rows_query(segment, 10)[0], table._rows_query(segment, 10)[1]))
+            assert "SEARCH" in plan and "USING INDEX items_qty" in plan and "TEMP B-TREE" not in plan, plan
+
+def test_column_named_rowid():
+    conn = sqlite3.connect(":memory:"); conn.execute("CREATE TABLE t (rowid INTEGER, v TEXT)")
+    conn.executemany("INSERT INTO t VALUES (1, ?)", [(f"v{i}",) for i in range(10)]); conn.commit()
+    table = SQLiteGridTable(conn, 't', page_size=3)
+    assert shown(table) == [["1", f"v{i}"] for i in range(10)]
+    table.SetValue(8, 1, "edited"); save(table)
+    assert shown(table) == [[_text(v) for v in row] for row in conn.execute("SELECT * FROM t ORDER BY _rowid_")]
@@ -0,0 +1,59 @@
+import wx
+import sqlite3
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+from connection import ConnectionProfile, open_connection
+from grid_components import TableSnapshot, read_table_snapshot
+
+class DatabaseWorker(threading.Thread):
+    """
+    Runs one piece of database work on a background thread with its own connection.
+    Results, errors and progress messages are posted back to the wx main thread with
+    wx.CallAfter. cancel() interrupts the running statement through Connection.interrupt(),
+    and a cancelled worker never delivers anything, even if it had already finished.
+    Workers open the database read-only through the given connection profile unless
+    they set read_only = False.
+    """
+    read_only = True
+    def __init__(self, path: str, on_done: Callable[[Any], None], on_error: Callable[[Exception], None], on_progress: Optional[Callable[[Any], None]] = None, profile: Optional[ConnectionProfile] = None):
+        super().__init__(daemon=True)
+        self.path = path; self.on_done = on_done; self.on_error = on_error; self.on_progress = on_progress; self.profile = profile or ConnectionProfile()
+        self._conn: Optional[sqlite3.Connection] = None; self._lock = threading.Lock(); self._cancelled = threading.Event()
+    @property
+    def cancelled(self) -> bool: return self._cancelled.is_set()
+    def connect(self) -> sqlite3.Connection: return open_connection(self.path, self.profile, self.read_only)
+    def work(self, conn: sqlite3.Connection) -> Any: raise NotImplementedError
+    def run(self):
+        try:
+            conn = self.connect()
+            with self._lock: self._conn = conn
+            try: result = None if self.cancelled else self.work(conn)
+            finally:
+                with self._lock: self._conn = None
+                conn.close()
+        except Exception as e:
+            if not self.cancelled: wx.CallAfter(self._deliver, self.on_error, e)
+        else:
+            if not self.cancelled: wx.CallAfter(self._deliver, self.on_done, result)
+    def cancel(self):
+        self._cancelled.set()
+        with self._lock:
+            if self._conn: self._conn.interrupt()
+    def progress(self, update: Any):
+        if self.on_progress and not self.cancelled: wx.CallAfter(self._deliver, self.on_progress, update)
+    def _deliver(self, callback: Callable[[Any], None], value: Any):
+        if not self.cancelled: callback(value)
+
+class DatabaseLoader(DatabaseWorker):
+    """Reads the table list of a database and a snapshot of its first table."""
+    def work(self, conn: sqlite3.Connection) -> Tuple[List[str], Optional[TableSnapshot]]:
+        self.progress("Reading table list...")
+        tables = sorted(row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table';"))
+        return tables, read_table_snapshot(conn, tables[0], progress=self.progress, sample=True) if tables else None
+
+class TableLoader(DatabaseWorker):
+    """Reads the schema, row count, first page and column width sample of one table."""
+    def __init__(self, path: str, table_name: str, *args, **kw):
+        super().__init__(path, *args, **kw); self.table_name = table_name
+    def work(self, conn: sqlite3.Connection) -> TableSnapshot: return read_table_snapshot(conn, self.table_name, progress=self.progress, sample=True)